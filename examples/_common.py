@@ -0,0 +1,14 @@
+"""Shared helpers for the example scripts."""
+
+import functools
+import os
+from typing import Dict
+
+from dotenv import load_dotenv
+
+
+@functools.lru_cache(maxsize=None)
+def env() -> Dict[str, str]:
+    """Load the .env file once and return a snapshot of the environment."""
+    load_dotenv()
+    return dict(os.environ)
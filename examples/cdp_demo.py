@@ -9,11 +9,7 @@ This example shows:
 
 from playwright_ai import PlaywrightAI
 import asyncio
-import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+from _common import env
 
 
 async def demonstrate_cdp():
@@ -25,7 +21,7 @@ async def demonstrate_cdp():
         headless=False,
         verbose=2,  # Verbose logging shows CDP details
         model_name="gpt-4o-mini",
-        model_client_options={"api_key": os.getenv("OPENAI_API_KEY")}
+        model_client_options={"api_key": env().get("OPENAI_API_KEY")}
     ) as browser:
         page = await browser.page()
         
@@ -104,7 +100,7 @@ async def demonstrate_cdp_vs_traditional():
 
 async def main():
     """Run all demonstrations."""
-    if not os.getenv("OPENAI_API_KEY"):
+    if not env().get("OPENAI_API_KEY"):
         print("Error: Please set OPENAI_API_KEY environment variable")
         return
     
@@ -2,11 +2,7 @@
 
 from playwright_ai import PlaywrightAI
 import asyncio
-import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+from _common import env
 
 
 async def debug_observe():
@@ -17,7 +13,7 @@ async def debug_observe():
         headless=False,
         verbose=0,  # Less verbose for cleaner output
         model_name="gpt-4o-mini",
-        model_client_options={"api_key": os.getenv("OPENAI_API_KEY")}
+        model_client_options={"api_key": env().get("OPENAI_API_KEY")}
     ) as browser:
         page = await browser.page()
         
@@ -62,7 +58,7 @@ async def debug_observe():
 
 async def main():
     """Run the debug."""
-    if not os.getenv("OPENAI_API_KEY"):
+    if not env().get("OPENAI_API_KEY"):
         print("No OpenAI API key found. Set OPENAI_API_KEY environment variable.")
         return
     
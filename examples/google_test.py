@@ -2,18 +2,14 @@
 
 from playwright_ai import PlaywrightAI
 import asyncio
-import os
 import sys
 from pathlib import Path
-from dotenv import load_dotenv
+from _common import env
 from pydantic import BaseModel
 
 # Add parent directory to path for development
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-# Load environment variables
-load_dotenv()
-
 
 class WebsiteData(BaseModel):
     title: str
@@ -31,7 +27,7 @@ async def test_openai_detailed():
         headless=False,
         verbose=1,  # Show some logs
         model_name="gpt-4o-mini",
-        model_client_options={"api_key": os.getenv("OPENAI_API_KEY")}
+        model_client_options={"api_key": env().get("OPENAI_API_KEY")}
     ) as browser:
         page = await browser.page()
         await page.goto("https://www.google.com")
@@ -78,7 +74,7 @@ async def test_openai_detailed():
 
 async def main():
     """Run the test."""
-    if not os.getenv("OPENAI_API_KEY"):
+    if not env().get("OPENAI_API_KEY"):
         print("No OpenAI API key found. Please set OPENAI_API_KEY environment variable.")
         return
 
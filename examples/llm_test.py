@@ -1,26 +1,22 @@
 """Test LLM providers."""
 
 import asyncio
-import os
 import sys
 from pathlib import Path
-from dotenv import load_dotenv
+from _common import env
 
 # Add parent directory to path for development
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-# Load environment variables
-load_dotenv()
-
 from playwright_ai import PlaywrightAI
 
 
 async def test_with_api_key():
     """Test with real API key if available."""
     # Check for API keys
-    has_openai = bool(os.getenv("OPENAI_API_KEY"))
-    has_anthropic = bool(os.getenv("ANTHROPIC_API_KEY"))
-    has_google = bool(os.getenv("GOOGLE_API_KEY"))
+    has_openai = bool(env().get("OPENAI_API_KEY"))
+    has_anthropic = bool(env().get("ANTHROPIC_API_KEY"))
+    has_google = bool(env().get("GOOGLE_API_KEY"))
     
     print("API Key Status:")
     print(f"  OpenAI: {'[OK]' if has_openai else '[FAIL]'}")
@@ -35,7 +31,7 @@ async def test_with_api_key():
             headless=True,
             verbose=0,
             model_name="gpt-4o-mini",
-            model_client_options={"api_key": os.getenv("OPENAI_API_KEY")}
+            model_client_options={"api_key": env().get("OPENAI_API_KEY")}
         ) as browser:
             page = await browser.page()
             await page.goto("https://example.com")
@@ -48,7 +44,7 @@ async def test_with_api_key():
             headless=True,
             verbose=0,
             model_name="claude-3-haiku",
-            model_client_options={"api_key": os.getenv("ANTHROPIC_API_KEY")}
+            model_client_options={"api_key": env().get("ANTHROPIC_API_KEY")}
         ) as browser:
             page = await browser.page()
             await page.goto("https://example.com")
@@ -61,7 +57,7 @@ async def test_with_api_key():
             headless=True,
             verbose=0,
             model_name="gemini-1.5-flash",
-            model_client_options={"api_key": os.getenv("GOOGLE_API_KEY")}
+            model_client_options={"api_key": env().get("GOOGLE_API_KEY")}
         ) as browser:
             page = await browser.page()
             await page.goto("https://example.com")
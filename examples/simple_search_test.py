@@ -2,17 +2,13 @@
 
 from playwright_ai import PlaywrightAI
 import asyncio
-import os
 import sys
 from pathlib import Path
-from dotenv import load_dotenv
+from _common import env
 
 # Add parent directory to path for development
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-# Load environment variables
-load_dotenv()
-
 
 async def test_simple_search():
     """Test search on a site without anti-automation measures."""
@@ -22,7 +18,7 @@ async def test_simple_search():
         headless=False,
         verbose=1,
         model_name="gpt-4o-mini",
-        model_client_options={"api_key": os.getenv("OPENAI_API_KEY")}
+        model_client_options={"api_key": env().get("OPENAI_API_KEY")}
     ) as browser:
         page = await browser.page()
         
@@ -93,7 +89,7 @@ async def test_simple_search():
 
 async def main():
     """Run the test."""
-    if not os.getenv("OPENAI_API_KEY"):
+    if not env().get("OPENAI_API_KEY"):
         print("No OpenAI API key found. Using mock LLM client.")
         print("Set OPENAI_API_KEY environment variable for real testing.")
         return
@@ -2,17 +2,13 @@
 
 from playwright_ai import PlaywrightAI
 import asyncio
-import os
 import sys
 from pathlib import Path
-from dotenv import load_dotenv
+from _common import env
 
 # Add parent directory to path for development
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-# Load environment variables
-load_dotenv()
-
 
 async def test_basic_agent():
     """Test basic agent functionality."""
@@ -22,7 +18,7 @@ async def test_basic_agent():
         headless=False,
         verbose=2,
         model_name="gpt-4o",
-        model_client_options={"api_key": os.getenv("OPENAI_API_KEY")}
+        model_client_options={"api_key": env().get("OPENAI_API_KEY")}
     ) as browser:
         page = await browser.page()
         
@@ -87,7 +83,7 @@ async def test_agent_error_handling():
         headless=False,
         verbose=1,
         model_name="gpt-4o-mini",
-        model_client_options={"api_key": os.getenv("OPENAI_API_KEY")}
+        model_client_options={"api_key": env().get("OPENAI_API_KEY")}
     ) as browser:
         page = await browser.page()
         
@@ -110,7 +106,7 @@ async def test_agent_models():
         headless=False,
         verbose=1,
         model_name="gpt-4o",
-        model_client_options={"api_key": os.getenv("OPENAI_API_KEY")}
+        model_client_options={"api_key": env().get("OPENAI_API_KEY")}
     ) as browser:
         page = await browser.page()
         await page.goto("https://www.example.com")
@@ -137,7 +133,7 @@ async def test_agent_models():
 
 async def main():
     """Run the tests."""
-    if not os.getenv("OPENAI_API_KEY"):
+    if not env().get("OPENAI_API_KEY"):
         print("WARNING: No OpenAI API key found.")
         print("Agent functionality is limited without API keys.")
         print("Set OPENAI_API_KEY environment variable for full testing.\n")
@@ -2,17 +2,13 @@
 
 from playwright_ai import PlaywrightAI
 import asyncio
-import os
 import sys
 from pathlib import Path
-from dotenv import load_dotenv
+from _common import env
 
 # Add parent directory to path for development
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-# Load environment variables
-load_dotenv()
-
 
 async def test_demo_agent_search():
     """Test demo agent performing search tasks."""
@@ -22,7 +18,7 @@ async def test_demo_agent_search():
         headless=False,
         verbose=2,
         model_name="gpt-4o",
-        model_client_options={"api_key": os.getenv("OPENAI_API_KEY")}
+        model_client_options={"api_key": env().get("OPENAI_API_KEY")}
     ) as browser:
         page = await browser.page()
         
@@ -60,7 +56,7 @@ async def test_demo_agent_navigation():
         headless=False,
         verbose=1,
         model_name="gpt-4o-mini",
-        model_client_options={"api_key": os.getenv("OPENAI_API_KEY")}
+        model_client_options={"api_key": env().get("OPENAI_API_KEY")}
     ) as browser:
         page = await browser.page()
         
@@ -88,7 +84,7 @@ async def test_demo_agent_clicking():
         headless=False,
         verbose=1,
         model_name="gpt-4o",
-        model_client_options={"api_key": os.getenv("OPENAI_API_KEY")}
+        model_client_options={"api_key": env().get("OPENAI_API_KEY")}
     ) as browser:
         page = await browser.page()
         await page.goto("https://www.example.com")
@@ -115,7 +111,7 @@ async def test_demo_agent_form():
         headless=False,
         verbose=1,
         model_name="gpt-4o",
-        model_client_options={"api_key": os.getenv("OPENAI_API_KEY")}
+        model_client_options={"api_key": env().get("OPENAI_API_KEY")}
     ) as browser:
         page = await browser.page()
         
@@ -147,7 +143,7 @@ async def test_demo_agent_complex():
         headless=False,
         verbose=1,
         model_name="gpt-4o",
-        model_client_options={"api_key": os.getenv("OPENAI_API_KEY")}
+        model_client_options={"api_key": env().get("OPENAI_API_KEY")}
     ) as browser:
         page = await browser.page()
         
@@ -173,7 +169,7 @@ async def test_demo_agent_complex():
 
 async def main():
     """Run demo agent tests."""
-    if not os.getenv("OPENAI_API_KEY"):
+    if not env().get("OPENAI_API_KEY"):
         print("WARNING: No OpenAI API key found.")
         print("Set OPENAI_API_KEY environment variable for testing.\n")
         return
@@ -2,17 +2,13 @@
 
 from playwright_ai import PlaywrightAI
 import asyncio
-import os
 import sys
 from pathlib import Path
-from dotenv import load_dotenv
+from _common import env
 
 # Add parent directory to path for development
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-# Load environment variables
-load_dotenv()
-
 
 async def test_agent_youtube_search():
     """Test agent performing YouTube search task."""
@@ -22,7 +18,7 @@ async def test_agent_youtube_search():
         headless=False,
         verbose=2,
         model_name="gpt-4o",
-        model_client_options={"api_key": os.getenv("OPENAI_API_KEY")}
+        model_client_options={"api_key": env().get("OPENAI_API_KEY")}
     ) as browser:
         page = await browser.page()
         
@@ -79,7 +75,7 @@ async def test_agent_google_search():
         headless=False,
         verbose=1,
         model_name="gpt-4o-mini",
-        model_client_options={"api_key": os.getenv("OPENAI_API_KEY")}
+        model_client_options={"api_key": env().get("OPENAI_API_KEY")}
     ) as browser:
         page = await browser.page()
         
@@ -139,7 +135,7 @@ async def test_agent_form_filling():
         headless=False,
         verbose=1,
         model_name="gpt-4o",
-        model_client_options={"api_key": os.getenv("OPENAI_API_KEY")}
+        model_client_options={"api_key": env().get("OPENAI_API_KEY")}
     ) as browser:
         page = await browser.page()
         
@@ -179,7 +175,7 @@ async def test_agent_workflow():
         headless=False,
         verbose=1,
         model_name="gpt-4o",
-        model_client_options={"api_key": os.getenv("OPENAI_API_KEY")},
+        model_client_options={"api_key": env().get("OPENAI_API_KEY")},
         enable_caching=True  # Enable caching for efficiency
     ) as browser:
         page = await browser.page()
@@ -246,7 +242,7 @@ async def test_agent_workflow():
 
 async def main():
     """Run all agent task tests."""
-    if not os.getenv("OPENAI_API_KEY"):
+    if not env().get("OPENAI_API_KEY"):
         print("WARNING: No OpenAI API key found.")
         print("Set OPENAI_API_KEY environment variable for testing.\n")
         return
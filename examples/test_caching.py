@@ -2,18 +2,14 @@
 
 from playwright_ai import PlaywrightAI
 import asyncio
-import os
 import sys
 import time
 from pathlib import Path
-from dotenv import load_dotenv
+from _common import env
 
 # Add parent directory to path for development
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-# Load environment variables
-load_dotenv()
-
 
 async def test_caching():
     """Test caching functionality with repeated actions."""
@@ -24,7 +20,7 @@ async def test_caching():
         verbose=2,  # More logs to see caching
         enable_caching=True,  # Enable caching
         model_name="gpt-4o-mini",
-        model_client_options={"api_key": os.getenv("OPENAI_API_KEY")}
+        model_client_options={"api_key": env().get("OPENAI_API_KEY")}
     ) as browser:
         page = await browser.page()
         await page.goto("https://www.google.com")
@@ -114,7 +110,7 @@ async def test_caching_disabled():
         verbose=1,
         enable_caching=False,  # Disable caching
         model_name="gpt-4o-mini",
-        model_client_options={"api_key": os.getenv("OPENAI_API_KEY")}
+        model_client_options={"api_key": env().get("OPENAI_API_KEY")}
     ) as browser:
         page = await browser.page()
         await page.goto("https://www.google.com")
@@ -142,7 +138,7 @@ async def test_caching_disabled():
 
 async def main():
     """Run the tests."""
-    if not os.getenv("OPENAI_API_KEY"):
+    if not env().get("OPENAI_API_KEY"):
         print("No OpenAI API key found. Using mock LLM client.")
         print("Set OPENAI_API_KEY environment variable for real testing.")
         print("Note: Mock client won't demonstrate real caching benefits.\n")
@@ -2,16 +2,46 @@
 
 from playwright_ai import PlaywrightAI
 import asyncio
-import os
 import sys
 from pathlib import Path
-from dotenv import load_dotenv
+from _common import env
 
 # Add parent directory to path for development
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-# Load environment variables
-load_dotenv()
+# Test page with different click scenarios
+CLICK_TEST_HTML = """
+<html>
+<body>
+    <h1>Click Test Page</h1>
+    
+    <!-- Normal button -->
+    <button id="normal-btn" onclick="document.getElementById('result').innerText='Normal button clicked'">
+        Normal Button
+    </button>
+    
+    <!-- Hidden button -->
+    <button id="hidden-btn" style="display: none" onclick="document.getElementById('result').innerText='Hidden button clicked'">
+        Hidden Button
+    </button>
+    
+    <!-- Covered button -->
+    <div style="position: relative">
+        <button id="covered-btn" onclick="document.getElementById('result').innerText='Covered button clicked'">
+            Covered Button
+        </button>
+        <div style="position: absolute; top: 0; left: 0; width: 100%; height: 100%; background: rgba(0,0,0,0.1);">
+            Overlay
+        </div>
+    </div>
+    
+    <!-- Link that opens in new tab -->
+    <a href="https://example.com" target="_blank" id="new-tab-link">Open in New Tab</a>
+    
+    <p id="result">No button clicked yet</p>
+</body>
+</html>
+"""
 
 
 async def test_self_healing():
@@ -22,7 +52,7 @@ async def test_self_healing():
         headless=False,
         verbose=2,  # More verbose logging
         model_name="gpt-4o-mini",
-        model_client_options={"api_key": os.getenv("OPENAI_API_KEY")}
+        model_client_options={"api_key": env().get("OPENAI_API_KEY")}
     ) as browser:
         page = await browser.page()
         
@@ -85,45 +115,11 @@ async def test_click_methods():
         headless=False,
         verbose=1,
         model_name="gpt-4o-mini",
-        model_client_options={"api_key": os.getenv("OPENAI_API_KEY")}
+        model_client_options={"api_key": env().get("OPENAI_API_KEY")}
     ) as browser:
         page = await browser.page()
         
-        # Create a test page with different click scenarios
-        test_html = """
-        <html>
-        <body>
-            <h1>Click Test Page</h1>
-            
-            <!-- Normal button -->
-            <button id="normal-btn" onclick="document.getElementById('result').innerText='Normal button clicked'">
-                Normal Button
-            </button>
-            
-            <!-- Hidden button -->
-            <button id="hidden-btn" style="display: none" onclick="document.getElementById('result').innerText='Hidden button clicked'">
-                Hidden Button
-            </button>
-            
-            <!-- Covered button -->
-            <div style="position: relative">
-                <button id="covered-btn" onclick="document.getElementById('result').innerText='Covered button clicked'">
-                    Covered Button
-                </button>
-                <div style="position: absolute; top: 0; left: 0; width: 100%; height: 100%; background: rgba(0,0,0,0.1);">
-                    Overlay
-                </div>
-            </div>
-            
-            <!-- Link that opens in new tab -->
-            <a href="https://example.com" target="_blank" id="new-tab-link">Open in New Tab</a>
-            
-            <p id="result">No button clicked yet</p>
-        </body>
-        </html>
-        """
-        
-        await page.goto("data:text/html," + test_html)
+        await page.set_content(CLICK_TEST_HTML, wait_until="domcontentloaded")
         
         print("1. Testing normal button click:")
         result1 = await page.act("Click the 'Normal Button'")
@@ -150,7 +146,7 @@ async def test_click_methods():
 
 async def main():
     """Run all tests."""
-    if not os.getenv("OPENAI_API_KEY"):
+    if not env().get("OPENAI_API_KEY"):
         print("WARNING: No OpenAI API key found. Set OPENAI_API_KEY environment variable.")
         return
     
@@ -5,7 +5,11 @@ Matches TypeScript implementation for better alignment.
 
 import asyncio
 import json
-from typing import Dict, List, Any, Optional, Tuple, Union, Set, TYPE_CHECKING
+import re
+import sys
+from collections import defaultdict, deque
+from functools import lru_cache
+from typing import Deque, Dict, List, Any, Optional, Tuple, Union, Set, TYPE_CHECKING
 from playwright.async_api import CDPSession, Frame
 import weakref
 
@@ -22,35 +26,42 @@ PUA_END = 0xF8FF
 # Non-breaking space characters
 NBSP_CHARS = {0x00A0, 0x202F, 0x2007, 0xFEFF}
 
+# Wrapper roles that get collapsed/pruned from the simplified tree
+_STRUCTURAL_ROLES = frozenset({"generic", "none"})
 
+# Roles that on their own don't justify keeping an AX node
+_NON_INTERACTIVE_ROLES = frozenset({"none", "generic", "InlineTextBox"})
+
+
+# str.translate tables: drop private-use glyphs / map NBSP-family to a space
+_PUA_TABLE = dict.fromkeys(range(PUA_START, PUA_END + 1))
+_NBSP_TABLE = dict.fromkeys(NBSP_CHARS, " ")
+
+# NBSP-family characters directly following a space (or another NBSP) collapse away
+_NBSP_CLASS = "".join(chr(c) for c in sorted(NBSP_CHARS))
+_REPEATED_NBSP_RE = re.compile(f"(?<=[ {_NBSP_CLASS}])[{_NBSP_CLASS}]+")
+
+
+@lru_cache(maxsize=4096)
 def clean_text(input_str: str) -> str:
     """
     Clean a string by removing private-use unicode characters, normalizing whitespace,
     and trimming the result. Matches TypeScript's cleanText function.
+    
+    Memoized and interned: AX names repeat heavily across a tree ("Search", "Menu", ...).
     """
-    output = ""
-    prev_was_space = False
+    # Skip private-use area glyphs
+    output = input_str.translate(_PUA_TABLE)
     
-    for char in input_str:
-        code = ord(char)
-        
-        # Skip private-use area glyphs
-        if PUA_START <= code <= PUA_END:
-            continue
-            
-        # Convert NBSP-family characters to a single space, collapsing repeats
-        if code in NBSP_CHARS:
-            if not prev_was_space:
-                output += " "
-                prev_was_space = True
-            continue
-            
-        # Append the character and update space tracker
-        output += char
-        prev_was_space = char == " "
+    # Convert NBSP-family characters to a single space, collapsing repeats
+    output = _REPEATED_NBSP_RE.sub("", output).translate(_NBSP_TABLE)
     
     # Trim leading/trailing spaces before returning
-    return output.strip()
+    return sys.intern(output.strip())
+
+
+# Precomputed indentation strings for format_simplified_tree
+_INDENTS = ["  " * i for i in range(64)]
 
 
 def format_simplified_tree(node: AccessibilityNode, level: int = 0) -> str:
@@ -58,35 +69,58 @@ def format_simplified_tree(node: AccessibilityNode, level: int = 0) -> str:
     Generate a human-readable, indented outline of an accessibility node tree.
     Matches TypeScript's formatSimplifiedTree function.
     """
-    indent = "  " * level
-    
-    # Use encodedId if available, otherwise fallback to nodeId
-    id_label = getattr(node, 'encodedId', None) or node.get('nodeId', '')
+    parts: List[str] = []
+    stack: List[Tuple[AccessibilityNode, int]] = [(node, level)]
     
-    # Prepare the formatted name segment if present
-    name = node.get('name', '')
-    name_part = f": {clean_text(name)}" if name else ""
-    
-    # Build current line and recurse into child nodes
-    current_line = f"{indent}[{id_label}] {node.get('role', '')}:{name_part}\n"
-    
-    children = node.get('children', [])
-    children_lines = "".join(
-        format_simplified_tree(child, level + 1) for child in children
-    )
+    # Iterative pre-order walk: children pushed R→L so they print L→R
+    while stack:
+        current, lvl = stack.pop()
+        indent = _INDENTS[lvl] if lvl < len(_INDENTS) else "  " * lvl
+        
+        # Use encodedId if available, otherwise fallback to nodeId
+        id_label = getattr(current, 'encodedId', None) or current.get('nodeId', '')
+        
+        # Prepare the formatted name segment if present
+        name = current.get('name', '')
+        name_part = f": {clean_text(name)}" if name else ""
+        
+        parts.append(f"{indent}[{id_label}] {current.get('role', '')}:{name_part}\n")
+        
+        children = current.get('children')
+        if children:
+            stack.extend((child, lvl + 1) for child in reversed(children))
     
-    return current_line + children_lines
+    return "".join(parts)
 
 
-# Memoized lowercase cache
-_lower_cache: Dict[str, str] = {}
+@lru_cache(maxsize=1024)
+def lc(raw: str) -> str:
+    """Memoized, interned lowercase conversion to avoid repeated .lower() calls."""
+    return sys.intern(raw.lower())
 
 
-def lc(raw: str) -> str:
-    """Memoized lowercase conversion to avoid repeated .lower() calls."""
-    if raw not in _lower_cache:
-        _lower_cache[raw] = raw.lower()
-    return _lower_cache[raw]
+# Interned so the DFS in build_backend_id_maps can compare lc() results by identity
+_IFRAME = sys.intern("iframe")
+
+
+# XPath segment lookup tables – sibling indices are small and tags a near-closed set
+_SEG_LUT_SIZE = 32
+_TEXT_SEGS = [f"text()[{i}]" for i in range(_SEG_LUT_SIZE)]
+_COMMENT_SEGS = [f"comment()[{i}]" for i in range(_SEG_LUT_SIZE)]
+
+_ELEMENT_SEGS: Dict[Tuple[str, int], str] = {}
+_ELEMENT_SEGS_MAX = 4096
+
+
+def _element_seg(tag: str, idx: int) -> str:
+    """Return the cached "tag[idx]" XPath segment, formatting it on first use."""
+    key = (tag, idx)
+    seg = _ELEMENT_SEGS.get(key)
+    if seg is None:
+        seg = f"{tag}[{idx}]"
+        if len(_ELEMENT_SEGS) < _ELEMENT_SEGS_MAX:
+            _ELEMENT_SEGS[key] = seg
+    return seg
 
 
 async def build_backend_id_maps(
@@ -98,18 +132,23 @@ async def build_backend_id_maps(
     Matches TypeScript's buildBackendIdMaps function.
     """
     # Choose CDP session
+    main_session = await sp.get_cdp_client()
     if not target_frame or target_frame == sp._page.main_frame:
-        session = await sp.get_cdp_client()
+        session = main_session
     else:
         try:
             # Try OOPIF session
             session = await sp._page.context.new_cdp_session(target_frame)
         except:
             # Fallback to main session for same-proc iframe
-            session = await sp.get_cdp_client()
+            session = main_session
+    
+    # Decided once so the finally-block never touches the session cache again
+    same_session = session is main_session
+    cdp_target = None if same_session else target_frame
     
     # Enable DOM domain
-    await sp.enable_cdp("DOM", target_frame if session != await sp.get_cdp_client() else None)
+    await sp.enable_cdp("DOM", cdp_target)
     
     try:
         # Get full DOM tree
@@ -125,32 +164,31 @@ async def build_backend_id_maps(
             root_fid = await get_cdp_frame_id(sp, target_frame)
             
             # For same-proc iframe, walk down to its contentDocument
-            if session == await sp.get_cdp_client():
+            if same_session:
                 frame_id = root_fid
                 owner_response = await sp.send_cdp("DOM.getFrameOwner", {"frameId": frame_id})
                 backend_node_id = owner_response["backendNodeId"]
                 
-                # Find iframe node in tree
+                # Find iframe node in tree (iterative DFS: children L→R, then contentDocument)
                 iframe_node = None
+                search_stack = [root]
                 
-                def locate(n: Dict[str, Any]) -> bool:
-                    nonlocal iframe_node
+                while search_stack:
+                    n = search_stack.pop()
                     if n.get("backendNodeId") == backend_node_id:
                         iframe_node = n
-                        return True
-                    
-                    # Check children
-                    for child in n.get("children", []):
-                        if locate(child):
-                            return True
+                        break
                     
-                    # Check content document
+                    # Check content document after all children
                     if "contentDocument" in n:
-                        return locate(n["contentDocument"])
+                        search_stack.append(n["contentDocument"])
                     
-                    return False
+                    # Check children
+                    children = n.get("children")
+                    if children:
+                        search_stack.extend(reversed(children))
                 
-                if not locate(root) or not iframe_node or "contentDocument" not in iframe_node:
+                if not iframe_node or "contentDocument" not in iframe_node:
                     raise Exception("iframe element or its contentDocument not found")
                 
                 start_node = iframe_node["contentDocument"]
@@ -160,111 +198,139 @@ async def build_backend_id_maps(
         tag_name_map: Dict[EncodedId, str] = {}
         xpath_map: Dict[EncodedId, str] = {}
         
-        stack = [(start_node, "", root_fid)]
+        # Paths travel as tuples of segments; the string is joined once per node
+        stack: List[Tuple[Dict[str, Any], Tuple[str, ...], Optional[str]]] = [(start_node, (), root_fid)]
         seen: Set[EncodedId] = set()
         
         while stack:
-            node, path, fid = stack.pop()
+            node, path_segs, fid = stack.pop()
             
             backend_id = node.get("backendNodeId")
             if not backend_id:
                 continue
                 
-            enc = sp.encode_with_frame_id(fid, backend_id)
+            # Interned: EncodedIds are reused as dict keys across every later pass
+            enc = sys.intern(sp.encode_with_frame_id(fid, backend_id))
             if enc in seen:
                 continue
             seen.add(enc)
             
-            tag_name_map[enc] = lc(node.get("nodeName", ""))
-            xpath_map[enc] = path
+            tag = lc(node.get("nodeName", ""))
+            tag_name_map[enc] = tag
+            xpath_map[enc] = "/" + "/".join(path_segs) if path_segs else ""
             
             # Recurse into sub-document if <iframe>
-            if lc(node.get("nodeName", "")) == "iframe" and "contentDocument" in node:
+            if tag is _IFRAME and "contentDocument" in node:
                 child_fid = node["contentDocument"].get("frameId", fid)
-                stack.append((node["contentDocument"], "", child_fid))
+                stack.append((node["contentDocument"], (), child_fid))
             
             # Push children
             kids = node.get("children", [])
             if kids:
                 # Build per-child XPath segment (L→R)
                 segs = []
-                ctr = {}
+                ctr: Dict[Tuple[int, str], int] = {}
+                ctr_get = ctr.get
                 
                 for child in kids:
                     tag = lc(child.get("nodeName", ""))
                     node_type = child.get("nodeType", 1)
-                    key = f"{node_type}:{tag}"
-                    idx = ctr.get(key, 0) + 1
+                    key = (node_type, tag)
+                    idx = ctr_get(key, 0) + 1
                     ctr[key] = idx
                     
                     if node_type == 3:  # TEXT_NODE
-                        seg = f"text()[{idx}]"
+                        seg = _TEXT_SEGS[idx] if idx < _SEG_LUT_SIZE else f"text()[{idx}]"
                     elif node_type == 8:  # COMMENT_NODE
-                        seg = f"comment()[{idx}]"
+                        seg = _COMMENT_SEGS[idx] if idx < _SEG_LUT_SIZE else f"comment()[{idx}]"
                     else:
-                        seg = f"{tag}[{idx}]"
+                        seg = _element_seg(tag, idx)
                     
                     segs.append(seg)
                 
                 # Push R→L so traversal remains L→R
                 for i in range(len(kids) - 1, -1, -1):
-                    stack.append((kids[i], f"{path}/{segs[i]}", fid))
+                    stack.append((kids[i], path_segs + (segs[i],), fid))
         
         return {"tagNameMap": tag_name_map, "xpathMap": xpath_map}
         
     finally:
         # Disable DOM domain
-        await sp.disable_cdp("DOM", target_frame if session != await sp.get_cdp_client() else None)
+        await sp.disable_cdp("DOM", cdp_target)
 
 
-async def clean_structural_nodes(
+def clean_structural_nodes(
     node: AccessibilityNode,
     tag_name_map: Dict[EncodedId, str],
     logger: Optional[Any] = None
 ) -> Optional[AccessibilityNode]:
     """
-    Recursively prune or collapse structural nodes in the AX tree to simplify hierarchy.
+    Prune or collapse structural nodes in the AX tree to simplify hierarchy.
     Matches TypeScript's cleanStructuralNodes function.
-    """
-    # Ignore negative pseudo-nodes
-    if int(node.get("nodeId", 0)) < 0:
-        return None
-    
-    # Leaf check
-    children = node.get("children", [])
-    if not children:
-        return None if node.get("role") in ("generic", "none") else node
     
-    # Recurse into children
-    cleaned_children = []
-    for child in children:
-        cleaned = await clean_structural_nodes(child, tag_name_map, logger)
-        if cleaned:
-            cleaned_children.append(cleaned)
-    
-    # Collapse/prune generic wrappers
-    role = node.get("role", "")
-    if role in ("generic", "none"):
-        if len(cleaned_children) == 1:
-            # Collapse single-child structural node
-            return cleaned_children[0]
-        elif len(cleaned_children) == 0:
-            # Remove empty structural node
-            return None
-    
-    # Replace generic role with real tag name (if we know it)
-    if role in ("generic", "none") and "encodedId" in node:
-        tag_name = tag_name_map.get(node["encodedId"])
-        if tag_name:
-            node["role"] = tag_name
+    Walks the tree iteratively (post-order) so deep pages cannot hit the
+    recursion limit.
+    """
+    # id(node) → cleaned node (None when pruned)
+    results: Dict[int, Optional[AccessibilityNode]] = {}
+    stack: List[Tuple[AccessibilityNode, bool]] = [(node, False)]
     
-    # Drop redundant StaticText children
-    pruned = remove_redundant_static_text_children(node, cleaned_children)
-    if not pruned and role in ("generic", "none"):
-        return None
+    while stack:
+        current, expanded = stack.pop()
+        children = current.get("children", [])
+        
+        if not expanded:
+            # Ignore negative pseudo-nodes
+            if int(current.get("nodeId", 0)) < 0:
+                results[id(current)] = None
+                continue
+            
+            # Leaf check
+            if not children:
+                results[id(current)] = None if current.get("role") in _STRUCTURAL_ROLES else current
+                continue
+            
+            # Revisit this node once all of its children are cleaned
+            stack.append((current, True))
+            stack.extend((child, False) for child in children)
+            continue
+        
+        # Gather cleaned children
+        cleaned_children = []
+        for child in children:
+            cleaned = results[id(child)]
+            if cleaned:
+                cleaned_children.append(cleaned)
+        
+        # Collapse/prune generic wrappers
+        role = current.get("role", "")
+        if role in _STRUCTURAL_ROLES:
+            if len(cleaned_children) == 1:
+                # Collapse single-child structural node
+                results[id(current)] = cleaned_children[0]
+                continue
+            elif len(cleaned_children) == 0:
+                # Remove empty structural node
+                results[id(current)] = None
+                continue
+        
+        # Replace generic role with real tag name (if we know it)
+        if role in _STRUCTURAL_ROLES and "encodedId" in current:
+            tag_name = tag_name_map.get(current["encodedId"])
+            if tag_name:
+                current["role"] = tag_name
+        
+        # Drop redundant StaticText children
+        pruned = remove_redundant_static_text_children(current, cleaned_children)
+        if not pruned and role in _STRUCTURAL_ROLES:
+            results[id(current)] = None
+            continue
+        
+        # Update node in place – it is already a private copy built by build_hierarchical_tree
+        current["children"] = pruned
+        results[id(current)] = current
     
-    # Return updated node
-    return {**node, "children": pruned}
+    return results[id(node)]
 
 
 def remove_redundant_static_text_children(
@@ -316,7 +382,7 @@ def extract_url_from_ax_node(node: AccessibilityNode) -> Optional[str]:
     return None
 
 
-async def build_hierarchical_tree(
+def build_hierarchical_tree(
     nodes: List[AccessibilityNode],
     tag_name_map: Dict[EncodedId, str],
     logger: Optional[Any] = None,
@@ -336,25 +402,30 @@ async def build_hierarchical_tree(
     iframe_list: List[AccessibilityNode] = []
     
     # Helper: keep only roles that matter to the LLM
-    def is_interactive(n: AccessibilityNode) -> bool:
-        role_obj = n.get("role", {})
-        role_value = role_obj.get("value", "") if isinstance(role_obj, dict) else ""
-        return role_value not in ("none", "generic", "InlineTextBox")
+    def is_interactive(role_value: str) -> bool:
+        return role_value not in _NON_INTERACTIVE_ROLES
     
     # Build "backendId → EncodedId[]" lookup from tagNameMap keys
-    backend_to_ids: Dict[int, List[EncodedId]] = {}
-    for enc in tag_name_map.keys():
+    backend_to_ids: Dict[int, List[EncodedId]] = defaultdict(list)
+    for enc in tag_name_map:
         # Split "ff-bb" format
-        parts = enc.split("-")
-        if len(parts) == 2:
-            backend = int(parts[1])
-            if backend not in backend_to_ids:
-                backend_to_ids[backend] = []
-            backend_to_ids[backend].append(enc)
+        _, sep, backend = enc.partition("-")
+        if sep:
+            backend_to_ids[int(backend)].append(enc)
     
-    # Pass 1 – copy/filter CDP nodes we want to keep
+    # Pre-pass – extract the fields every later pass needs from each CDP node once
+    # (role is an object with a 'value' property)
+    infos: List[Tuple[str, str, Optional[str]]] = []
     for node in nodes:
-        node_id = node.get("nodeId", "")
+        role_obj = node.get("role", {})
+        infos.append((
+            node.get("nodeId", ""),
+            role_obj.get("value", "") if isinstance(role_obj, dict) else "",
+            node.get("parentId"),
+        ))
+    
+    # Pass 1 – copy/filter CDP nodes we want to keep
+    for node, (node_id, role_value, _) in zip(nodes, infos):
         if int(node_id) < 0:  # Skip pseudo-nodes
             continue
         
@@ -367,7 +438,7 @@ async def build_hierarchical_tree(
         keep = (
             name_value.strip() or
             node.get("childIds", []) or
-            is_interactive(node)
+            is_interactive(role_value)
         )
         
         if not keep:
@@ -386,13 +457,9 @@ async def build_hierarchical_tree(
             id_to_url[encoded_id] = url
         
         # Create rich node
-        # Extract role value (role is an object with 'value' property)
-        role_obj = node.get("role", {})
-        role_value = role_obj.get("value", "") if isinstance(role_obj, dict) else ""
-        
         rich_node = {
-            "nodeId": node_id,
-            "role": role_value,
+            "nodeId": sys.intern(node_id),
+            "role": sys.intern(role_value),
         }
         
         if encoded_id:
@@ -417,15 +484,10 @@ async def build_hierarchical_tree(
         node_map[node_id] = rich_node
     
     # Pass 2 – parent-child wiring
-    for node in nodes:
-        node_id = node.get("nodeId", "")
-        role_obj = node.get("role", {})
-        role_value = role_obj.get("value", "") if isinstance(role_obj, dict) else ""
-        
+    for node_id, role_value, parent_id in infos:
         if role_value == "Iframe":
             iframe_list.append({"role": role_value, "nodeId": node_id})
         
-        parent_id = node.get("parentId")
         if not parent_id:
             continue
             
@@ -439,13 +501,13 @@ async def build_hierarchical_tree(
     
     # Pass 3 – prune structural wrappers & tidy tree
     roots = []
-    for node in nodes:
-        if not node.get("parentId") and node.get("nodeId", "") in node_map:
-            roots.append(node_map[node["nodeId"]])
+    for node_id, _, parent_id in infos:
+        if not parent_id and node_id in node_map:
+            roots.append(node_map[node_id])
     
     cleaned_roots = []
     for root in roots:
-        cleaned = await clean_structural_nodes(root, tag_name_map, logger)
+        cleaned = clean_structural_nodes(root, tag_name_map, logger)
         if cleaned:
             cleaned_roots.append(cleaned)
     
@@ -522,32 +584,38 @@ async def find_scrollable_element_ids(
     else:
         xpaths = await stagehand_page._page.evaluate("() => window.getScrollableElementXpaths ? window.getScrollableElementXpaths() : []")
     
-    backend_ids = set()
+    xpaths = [xpath for xpath in xpaths if xpath]
+    if not xpaths:
+        return set()
     
-    for xpath in xpaths:
-        if not xpath:
-            continue
-            
+    async def resolve_backend_id(xpath: str) -> Optional[int]:
         try:
             # Resolve XPath to object ID
             object_id = await resolve_object_id_for_xpath(stagehand_page, xpath, target_frame)
+            if not object_id:
+                return None
             
-            if object_id:
-                # Get backend node ID
-                response = await stagehand_page.send_cdp(
-                    "DOM.describeNode",
-                    {"objectId": object_id},
-                    target_frame
-                )
-                node = response.get("node", {})
-                backend_id = node.get("backendNodeId")
-                if backend_id:
-                    backend_ids.add(backend_id)
-        except:
+            # Get backend node ID
+            response = await stagehand_page.send_cdp(
+                "DOM.describeNode",
+                {"objectId": object_id},
+                target_frame
+            )
+            return response.get("node", {}).get("backendNodeId")
+        except Exception:
             # Skip failed XPath resolutions
-            pass
+            return None
     
-    return backend_ids
+    # Create (and cache) the CDP session up front so the concurrent
+    # resolutions below share it instead of racing to open their own
+    try:
+        await stagehand_page.get_cdp_client(target_frame)
+    except Exception:
+        return set()
+    
+    # Pipeline the per-XPath round-trips instead of awaiting them one by one
+    backend_ids = await asyncio.gather(*(resolve_backend_id(xpath) for xpath in xpaths))
+    return {backend_id for backend_id in backend_ids if backend_id}
 
 
 async def resolve_object_id_for_xpath(
@@ -592,17 +660,19 @@ def decorate_roles(nodes: List[Dict[str, Any]], scrollable_ids: Set[int]) -> Lis
     """
     decorated = []
     for node in nodes:
-        decorated_node = node.copy()
         backend_id = node.get("backendDOMNodeId")
         
+        # Only scrollable nodes are copied; the rest pass through untouched
         if backend_id and backend_id in scrollable_ids:
-            role = node.get("role", {}).get("value", "")
-            if role and role not in ("generic", "none"):
-                decorated_node["role"]["value"] = f"scrollable, {role}"
+            role_obj = {**node.get("role", {})}
+            role = role_obj.get("value", "")
+            if role and role not in _STRUCTURAL_ROLES:
+                role_obj["value"] = f"scrollable, {role}"
             else:
-                decorated_node["role"]["value"] = "scrollable"
-        
-        decorated.append(decorated_node)
+                role_obj["value"] = "scrollable"
+            decorated.append({**node, "role": role_obj})
+        else:
+            decorated.append(node)
     
     return decorated
 
@@ -676,7 +746,7 @@ async def get_accessibility_tree(
         decorated_nodes = decorate_roles(nodes, scrollable_ids)
         
         # Build hierarchical tree
-        tree_result = await build_hierarchical_tree(
+        tree_result = build_hierarchical_tree(
             decorated_nodes,
             tag_name_map,
             logger,
@@ -692,6 +762,16 @@ async def get_accessibility_tree(
         await stagehand_page.disable_cdp("Accessibility", target_frame)
 
 
+# Outline label inside the first brackets, e.g. "[0-42]" or "[42]"
+_BRACKET_LABEL_RE = re.compile(r'^\s*\[([^\]]+)]')
+
+# "<ordinal>-<backend>" EncodedId label
+_ENCODED_ID_RE = re.compile(r'^\d+-\d+$')
+
+# XPath step addressing an <iframe>, e.g. "iframe[2]"
+_IFRAME_STEP_RE = re.compile(r'iframe\[\d+]$', re.IGNORECASE)
+
+
 def inject_subtrees(tree: str, id_to_tree: Dict[EncodedId, str]) -> str:
     """
     Inject simplified subtree outlines into the main frame outline for nested iframes.
@@ -705,53 +785,52 @@ def inject_subtrees(tree: str, id_to_tree: Dict[EncodedId, str]) -> str:
     Returns:
         A single combined text outline with iframe subtrees injected
     """
+    # No iframe subtrees (the common single-frame page): nothing to splice in
+    if not id_to_tree:
+        return tree
+    
+    # backendId → EncodedIds, built once instead of re-scanning id_to_tree per line
+    by_backend: Dict[int, List[EncodedId]] = defaultdict(list)
+    for key in id_to_tree:
+        # Split "ff-bb" format
+        _, sep, backend = key.partition("-")
+        if sep:
+            by_backend[int(backend)].append(key)
+    
     def unique_by_backend(backend_id: int) -> Optional[EncodedId]:
         """
         Return the *only* EncodedId that ends with this backend-id.
         If several frames share that backend-id we return None
         (avoids guessing the wrong subtree).
         """
-        found: Optional[EncodedId] = None
-        hit = 0
-        for enc in id_to_tree.keys():
-            # Split "ff-bb" format
-            parts = enc.split("-")
-            if len(parts) == 2:
-                backend = int(parts[1])
-                if backend == backend_id:
-                    hit += 1
-                    if hit > 1:
-                        return None  # collision → abort
-                    found = enc
-        return found if hit == 1 else None
-    
-    # Stack frame for DFS injection
-    class StackFrame:
-        def __init__(self, lines: List[str], idx: int, indent: str):
-            self.lines = lines
-            self.idx = idx
-            self.indent = indent
-    
-    stack = [StackFrame(tree.split("\n"), 0, "")]
+        matches = by_backend.get(backend_id)
+        return matches[0] if matches and len(matches) == 1 else None
+    
+    # DFS injection stack; each frame is a mutable [lines, idx, indent] list
+    stack: List[List[Any]] = [[tree.split("\n"), 0, ""]]
     out: List[str] = []
     visited: Set[EncodedId] = set()  # avoid infinite loops
     
+    # Local bindings for the hot loop
+    out_append = out.append
+    stack_append = stack.append
+    
     # Depth-first injection walk
     while stack:
         top = stack[-1]
+        lines, idx, frame_indent = top
         
-        if top.idx >= len(top.lines):
+        if idx >= len(lines):
             stack.pop()
             continue
         
-        raw = top.lines[top.idx]
-        top.idx += 1
-        line = top.indent + raw
-        out.append(line)
+        raw = lines[idx]
+        top[1] = idx + 1
+        line = frame_indent + raw
+        out_append(line)
         
         # grab whatever sits inside the first brackets, e.g. "[0-42]" or "[42]"
-        import re
-        m = re.match(r'^\s*\[([^\]]+)]', raw)
+        m = _BRACKET_LABEL_RE.match(raw)
         if not m:
             continue
         
@@ -766,11 +845,11 @@ def inject_subtrees(tree: str, id_to_tree: Dict[EncodedId, str]) -> str:
         else:
             # attempt to extract backendId from "<ordinal>-<backend>" or pure numeric label
             backend_id: Optional[int] = None
-            # Check if it matches encoded ID pattern
-            if re.match(r'^\d+-\d+$', label):
-                backend_id = int(label.split("-")[1])
-            elif label.isdigit():
+            # Pure numeric labels skip the encoded ID pattern check
+            if label.isdigit():
                 backend_id = int(label)
+            elif _ENCODED_ID_RE.match(label):
+                backend_id = int(label.split("-")[1])
             
             if backend_id is not None:
                 alt = unique_by_backend(backend_id)
@@ -783,9 +862,8 @@ def inject_subtrees(tree: str, id_to_tree: Dict[EncodedId, str]) -> str:
         
         visited.add(enc)
         # Get indent from the line
-        indent_match = re.match(r'^(\s*)', line)
-        indent = indent_match.group(0) if indent_match else ""
-        stack.append(StackFrame(child.split("\n"), 0, indent + "  "))
+        indent = line[:len(line) - len(line.lstrip())]
+        stack_append([child.split("\n"), 0, indent + "  "])
     
     return "\n".join(out)
 
@@ -814,10 +892,6 @@ async def resolve_frame_chain(
     Raises:
         Error if an iframe cannot be found or the final XPath cannot be resolved
     """
-    import re
-    
-    IFRAME_STEP_RE = re.compile(r'iframe\[\d+]$', re.IGNORECASE)
-    
     path = abs_path if abs_path.startswith("/") else "/" + abs_path
     ctx_frame: Optional[Frame] = None  # current frame
     chain: List[Frame] = []  # collected frames
@@ -838,7 +912,7 @@ async def resolve_frame_chain(
         for i, step in enumerate(steps):
             buf.append(step)
             
-            if IFRAME_STEP_RE.search(step):
+            if _IFRAME_STEP_RE.search(step):
                 # "/…/iframe[k]" found – descend into that frame
                 selector = "xpath=/" + "/".join(buf)
                 current_frame = ctx_frame or sp._page.main_frame
@@ -864,7 +938,8 @@ async def resolve_frame_chain(
 
 async def get_frame_root_backend_node_id(
     sp: 'PlaywrightAIPage',
-    frame: Optional[Frame]
+    frame: Optional[Frame],
+    fid: Optional[str] = None
 ) -> Optional[int]:
     """
     Get the backendNodeId of the iframe element that contains a given Playwright.Frame.
@@ -873,6 +948,7 @@ async def get_frame_root_backend_node_id(
     Args:
         sp: The StagehandPage instance for issuing CDP commands
         frame: The Playwright.Frame whose host iframe element to locate
+        fid: Already-resolved CDP frameId for ``frame``, if the caller has one
         
     Returns:
         The backendNodeId of the iframe element, or None if not applicable
@@ -882,7 +958,8 @@ async def get_frame_root_backend_node_id(
         return None
     
     # Resolve the CDP frameId for the target iframe frame
-    fid = await get_cdp_frame_id(sp, frame)
+    if fid is None:
+        fid = await get_cdp_frame_id(sp, frame)
     if not fid:
         return None
     
@@ -891,6 +968,29 @@ async def get_frame_root_backend_node_id(
     return response.get("backendNodeId")
 
 
+# Flat [tag, index, tag, index, …] pairs for an element, element → root
+_FRAME_ROOT_PAIRS_JS = """
+    (node) => {
+        const out = [];
+        for (let el = node; el; el = el.parentElement) {
+            const tag = el.tagName;
+            let i = 1;
+            for (let sib = el.previousElementSibling; sib; sib = sib.previousElementSibling) {
+                if (sib.tagName === tag) i += 1;
+            }
+            out.push(tag.toLowerCase(), i);
+        }
+        return out;
+    }
+"""
+
+
+def _xpath_from_pairs(chain: List[Any]) -> str:
+    """Join element → root [tag, index, …] pairs into a root-first XPath."""
+    segs = [f"{chain[i]}[{chain[i + 1]}]" for i in range(len(chain) - 2, -1, -2)]
+    return "/" + "/".join(segs)
+
+
 async def get_frame_root_xpath(frame: Optional[Frame]) -> str:
     """
     Compute the absolute XPath for the iframe element hosting a given Playwright.Frame.
@@ -910,28 +1010,67 @@ async def get_frame_root_xpath(frame: Optional[Frame]) -> str:
     handle = await frame.frame_element()
     if not handle:
         return "/"
+    
+    # Join root-first in Python instead of unshifting strings in JS
+    return _xpath_from_pairs(await handle.evaluate(_FRAME_ROOT_PAIRS_JS))
+
+
+async def get_frame_root_xpath_via_cdp(
+    sp: 'PlaywrightAIPage',
+    frame: Optional[Frame],
+    backend_node_id: Optional[int] = None
+) -> str:
+    """
+    Compute the iframe XPath from its owner backendNodeId over CDP.
+    
+    Skips Playwright's frame_element() lookup by resolving the already-known
+    owner node directly. Falls back to get_frame_root_xpath when the owner
+    cannot be resolved from the page session (e.g. iframes nested in OOPIFs).
+    
+    Args:
+        sp: The PlaywrightAIPage instance for issuing CDP commands
+        frame: The Playwright.Frame whose iframe element to locate
+        backend_node_id: Owner backendNodeId, if the caller already has it
         
-    # Evaluate the element's absolute XPath within the page context
-    return await handle.evaluate("""
-        (node) => {
-            const pos = (el) => {
-                let i = 1;
-                for (let sib = el.previousElementSibling; sib; sib = sib.previousElementSibling) {
-                    if (sib.tagName === el.tagName) i += 1;
-                }
-                return i;
-            };
-            const segs = [];
-            for (let el = node; el; el = el.parentElement) {
-                segs.unshift(`${el.tagName.toLowerCase()}[${pos(el)}]`);
+    Returns:
+        The XPath of the iframe element, or "/" for the main frame
+    """
+    if not frame or frame == sp._page.main_frame:
+        return "/"
+    
+    try:
+        if backend_node_id is None:
+            backend_node_id = await get_frame_root_backend_node_id(sp, frame)
+        if backend_node_id is None:
+            return await get_frame_root_xpath(frame)
+        
+        resolved = await sp.send_cdp("DOM.resolveNode", {"backendNodeId": backend_node_id})
+        object_id = resolved["object"]["objectId"]
+        response = await sp.send_cdp(
+            "Runtime.callFunctionOn",
+            {
+                "objectId": object_id,
+                "functionDeclaration": f"function() {{ return ({_FRAME_ROOT_PAIRS_JS})(this); }}",
+                "returnByValue": True
             }
-            return `/${segs.join("/")}`;
-        }
-    """)
+        )
+        return _xpath_from_pairs(response["result"]["value"])
+    except Exception:
+        return await get_frame_root_xpath(frame)
 
 
 class FrameSnapshot:
     """Container for frame snapshot data."""
+    __slots__ = (
+        "tree",
+        "xpath_map",
+        "url_map",
+        "frame_xpath",
+        "backend_node_id",
+        "parent_frame",
+        "frame_id",
+    )
+    
     def __init__(
         self,
         tree: str,
@@ -976,63 +1115,122 @@ async def get_accessibility_tree_with_frames(
     target_frames: Optional[List[Frame]] = None  # full chain, main-first
     inner_xpath: Optional[str] = None
     
-    if root_xpath and root_xpath.strip():
-        frames, rest = await resolve_frame_chain(stagehand_page, root_xpath.strip())
+    focus = root_xpath.strip() if root_xpath else ""
+    if focus in ("/", "//"):
+        # document root: no iframe steps to resolve, stays on the main frame
+        inner_xpath = focus
+    elif focus:
+        frames, rest = await resolve_frame_chain(stagehand_page, focus)
         target_frames = frames if frames else None  # empty → None
         inner_xpath = rest
     
+    # O(1) chain membership / last-hop checks for the walk below
+    target_ids = frozenset(map(id, target_frames)) if target_frames else None
+    last_target_id = id(target_frames[-1]) if target_frames else None
+    
     main_only_filter = bool(inner_xpath and not target_frames)
     
-    # 2. depth-first walk – collect snapshots
-    snapshots: List[FrameSnapshot] = []
-    frame_stack: List[Frame] = [main]
+    # Per-page Frame → (url, frameId, owner backendNodeId), kept across calls
+    frame_meta_cache = stagehand_page._frame_meta_cache
     
-    print(f"DEBUG: Starting frame walk. Main frame: {main.url}")
-    print(f"DEBUG: Main frame has {len(main.child_frames)} child frames")
+    # CDP frameIds resolved during this walk, keyed by id(frame)
+    frame_id_cache: Dict[int, Optional[str]] = {}
+    # one shared Page.getFrameTree fetch, indexed by (depth, url)
+    frame_tree_index: Optional[asyncio.Future] = None
+    
+    async def index_frame_tree() -> Dict[Tuple[int, str], str]:
+        response = await stagehand_page.send_cdp("Page.getFrameTree")
+        index: Dict[Tuple[int, str], str] = {}
+        # pre-order DFS, first match wins – same pick as get_cdp_frame_id
+        stack: List[Tuple[Dict[str, Any], int]] = [(response["frameTree"], 0)]
+        while stack:
+            node, depth = stack.pop()
+            index.setdefault((depth, node["frame"]["url"]), node["frame"]["id"])
+            for child in reversed(node.get("childFrames", [])):
+                stack.append((child, depth + 1))
+        return index
+    
+    async def cached_fid(f: Frame) -> Optional[str]:
+        nonlocal frame_tree_index
+        key = id(f)
+        if key not in frame_id_cache:
+            fid: Optional[str] = None
+            if f != main:
+                if frame_tree_index is None:
+                    frame_tree_index = asyncio.ensure_future(index_frame_tree())
+                try:
+                    index = await frame_tree_index
+                except Exception:
+                    index = {}
+                depth = 0
+                p = f.parent_frame
+                while p:
+                    depth += 1
+                    p = p.parent_frame
+                fid = index.get((depth, f.url))
+                if not fid:
+                    # not in the page-session tree (OOPIF) – per-frame lookup
+                    fid = await get_cdp_frame_id(stagehand_page, f)
+            frame_id_cache[key] = fid
+        return frame_id_cache[key]
+    
+    # 2. depth-first walk – pick the frames to snapshot (no CDP traffic here)
+    # (an inner xpath with no frame chain lives in main – skip the walk)
+    frames_to_snapshot: List[Tuple[Frame, Optional[str]]] = (
+        [(main, inner_xpath)] if main_only_filter else []
+    )
+    frame_stack: Deque[Frame] = deque() if main_only_filter else deque([main])
     
     while frame_stack:
         frame = frame_stack.pop()
-        print(f"DEBUG: Processing frame: {frame.url}")
         
         # unconditional: enqueue children so we can reach deep targets
         frame_stack.extend(frame.child_frames)
-        print(f"DEBUG: Frame has {len(frame.child_frames)} child frames")
         
         # skip frames that are outside the requested chain / slice
-        if target_frames and frame not in target_frames:
-            continue
-        # Only skip child frames if we have a specific inner_xpath to search for
-        if not target_frames and frame != main and inner_xpath:
+        if target_ids is not None and id(frame) not in target_ids:
             continue
         
         # selector to forward (unchanged)
         selector = None
         if target_frames:
-            if frame == target_frames[-1]:
+            if id(frame) == last_target_id:
                 selector = inner_xpath
         else:
             if frame == main:
                 selector = inner_xpath
         
+        frames_to_snapshot.append((frame, selector))
+    
+    async def snapshot_frame(frame: Frame, selector: Optional[str]) -> Optional[FrameSnapshot]:
         try:
-            print(f"DEBUG: Getting accessibility tree for frame: {frame.url}")
-            res = await get_accessibility_tree(
-                stagehand_page,
-                logger,
-                selector,
-                frame
-            )
-            print(f"DEBUG: Got tree with {len(res.get('tree', []))} nodes")
+            is_main = frame == main
             
-            # guard: main frame has no backendNodeId
-            backend_id = None
-            if frame != main:
-                backend_id = await get_frame_root_backend_node_id(stagehand_page, frame)
-            
-            frame_xpath = "/" if frame == main else await get_frame_root_xpath(frame)
+            async def frame_meta() -> Tuple[Optional[str], Optional[int], str]:
+                # guard: main frame has no frameId / backendNodeId and sits at "/"
+                if is_main:
+                    return None, None, "/"
+                
+                # reuse ids from earlier calls while the frame stays on the same URL
+                url = frame.url
+                cached = frame_meta_cache.get(frame)
+                if cached is not None and cached[0] == url:
+                    frame_id, backend_id = cached[1], cached[2]
+                else:
+                    frame_id = await cached_fid(frame)
+                    backend_id = await get_frame_root_backend_node_id(stagehand_page, frame, frame_id)
+                    frame_meta_cache[frame] = (url, frame_id, backend_id)
+                
+                # the xpath is positional, so recompute it every time: the parent
+                # DOM can change around the iframe without its URL changing.
+                # Reuse the owner node instead of frame_element()
+                frame_xpath = await get_frame_root_xpath_via_cdp(stagehand_page, frame, backend_id)
+                return frame_id, backend_id, frame_xpath
             
-            # Resolve the CDP frameId for this Playwright Frame (None for main)
-            frame_id = await get_cdp_frame_id(stagehand_page, frame)
+            res, (frame_id, backend_id, frame_xpath) = await asyncio.gather(
+                get_accessibility_tree(stagehand_page, logger, selector, frame),
+                frame_meta(),
+            )
             
             snapshot = FrameSnapshot(
                 tree=res["simplified"].rstrip(),
@@ -1043,14 +1241,9 @@ async def get_accessibility_tree_with_frames(
                 parent_frame=frame.parent_frame,
                 frame_id=frame_id
             )
-            snapshots.append(snapshot)
-            print(f"DEBUG: Added snapshot for frame {frame.url[:50]}... with tree length {len(snapshot.tree)}")
-            
-            if main_only_filter:
-                break  # nothing else to fetch
+            return snapshot
                 
         except Exception as err:
-            print(f"DEBUG: Error getting accessibility tree for frame: {err}")
             if logger:
                 logger({
                     "category": "observation",
@@ -1058,6 +1251,24 @@ async def get_accessibility_tree_with_frames(
                     "level": 1,
                     "auxiliary": {"error": {"value": str(err), "type": "string"}}
                 })
+            return None
+    
+    # Snapshot all selected frames concurrently; results keep walk order.
+    # Same-process iframes share the main CDP session, so hold DOM and
+    # Accessibility enabled on it for the whole gather: the per-frame
+    # disables are reference-counted and cannot switch them off under a
+    # sibling frame (or frame_meta's DOM.getFrameOwner) mid-snapshot
+    await stagehand_page.enable_cdp("DOM")
+    await stagehand_page.enable_cdp("Accessibility")
+    try:
+        results = await asyncio.gather(
+            *(snapshot_frame(frame, selector) for frame, selector in frames_to_snapshot),
+            return_exceptions=True
+        )
+    finally:
+        await stagehand_page.disable_cdp("Accessibility")
+        await stagehand_page.disable_cdp("DOM")
+    snapshots: List[FrameSnapshot] = [s for s in results if isinstance(s, FrameSnapshot)]
     
     # 3. merge per-frame maps
     combined_xpath_map: Dict[EncodedId, str] = {}
@@ -1067,32 +1278,49 @@ async def get_accessibility_tree_with_frames(
     for s in snapshots:
         seg[s.parent_frame] = s.frame_xpath
     
-    # recursively build the full prefix for a frame
+    # hops normalized once: "/" contributes nothing (None), others keep (raw, lstripped)
+    norm_hop: Dict[Optional[Frame], Optional[Tuple[str, str]]] = {
+        parent: None if hop == "/" else (hop, hop.lstrip('/'))
+        for parent, hop in seg.items()
+    }
+    no_hop = ("", "")
+    
+    # full prefix per frame, memoized so each ancestor chain is joined once
+    prefix_by_frame: Dict[Optional[Frame], str] = {None: ""}  # None = reached main
+    
     def full_prefix(f: Optional[Frame]) -> str:
-        if not f:
-            return ""  # reached main
-        parent = f.parent_frame
-        above = full_prefix(parent)
-        hop = seg.get(parent, "")
-        if hop == "/":
-            return above
-        elif above:
-            return f"{above.rstrip('/')}/{hop.lstrip('/')}"
-        else:
-            return hop
+        # climb to the nearest frame whose prefix is already known …
+        chain: List[Frame] = []
+        while f not in prefix_by_frame:
+            chain.append(f)
+            f = f.parent_frame
+        above = prefix_by_frame[f]
+        # … then extend it shallow → deep
+        for f in reversed(chain):
+            hop = norm_hop.get(f.parent_frame, no_hop)
+            if hop is not None:
+                above = f"{above.rstrip('/')}/{hop[1]}" if above else hop[0]
+            prefix_by_frame[f] = above
+        return above
     
     for snap in snapshots:
         prefix = ""
         if snap.frame_xpath != "/":
             prefix = f"{full_prefix(snap.parent_frame)}{snap.frame_xpath}"
         
-        for enc, local in snap.xpath_map.items():
-            if local == "":
-                combined_xpath_map[enc] = prefix or "/"
-            elif prefix:
-                combined_xpath_map[enc] = f"{prefix.rstrip('/')}/{local.lstrip('/')}"
-            else:
-                combined_xpath_map[enc] = local
+        if not prefix:
+            # nothing to prepend: copy straight across, patching empty locals
+            combined_xpath_map.update(snap.xpath_map)
+            if "" in snap.xpath_map.values():
+                for enc, local in snap.xpath_map.items():
+                    if local == "":
+                        combined_xpath_map[enc] = "/"
+        else:
+            joiner = f"{prefix.rstrip('/')}/"
+            combined_xpath_map.update({
+                enc: joiner + local.lstrip('/') if local else prefix
+                for enc, local in snap.xpath_map.items()
+            })
         
         combined_url_map.update(snap.url_map)
     
@@ -1105,17 +1333,11 @@ async def get_accessibility_tree_with_frames(
             id_to_tree[enc] = snap.tree
     
     # 5. stitch everything together
-    print(f"DEBUG: Total snapshots collected: {len(snapshots)}")
-    print(f"DEBUG: id_to_tree entries: {len(id_to_tree)}")
-    
     root_snap = next((s for s in snapshots if s.frame_xpath == "/"), None)
     if root_snap:
-        print(f"DEBUG: Found root snapshot with tree length: {len(root_snap.tree)}")
         combined_tree = inject_subtrees(root_snap.tree, id_to_tree)
-        print(f"DEBUG: Combined tree length after injection: {len(combined_tree)}")
     else:
         combined_tree = snapshots[0].tree if snapshots else ""
-        print(f"DEBUG: No root snapshot, using first snapshot")
     
     result = {
         "combinedTree": combined_tree,
@@ -1123,5 +1345,4 @@ async def get_accessibility_tree_with_frames(
         "combinedUrlMap": combined_url_map
     }
     
-    print(f"DEBUG: Returning result with combinedTree length: {len(result['combinedTree'])}")
     return result
\ No newline at end of file
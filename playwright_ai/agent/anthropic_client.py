@@ -323,8 +323,8 @@ class AnthropicAgentClient(BaseMultiStepClient):
                             "type": "image",
                             "source": {
                                 "type": "base64",
-                                "media_type": "image/png",
-                                "data": screenshot.replace("data:image/png;base64,", "")
+                                "media_type": "image/jpeg",
+                                "data": screenshot.replace("data:image/jpeg;base64,", "")
                             }
                         }]
                     }
@@ -363,8 +363,8 @@ class AnthropicAgentClient(BaseMultiStepClient):
                                 "type": "image",
                                 "source": {
                                     "type": "base64",
-                                    "media_type": "image/png",
-                                    "data": screenshot.replace("data:image/png;base64,", "")
+                                    "media_type": "image/jpeg",
+                                    "data": screenshot.replace("data:image/jpeg;base64,", "")
                                 }
                             }, {
                                 "type": "text",
@@ -471,8 +471,8 @@ class AnthropicAgentClient(BaseMultiStepClient):
         """Capture screenshot and return as data URL."""
         if self._screenshot_provider:
             try:
-                base64_image = await self._screenshot_provider()
-                return f"data:image/png;base64,{base64_image}"
+                base64_image = await self._screenshot_base64()
+                return f"data:image/jpeg;base64,{base64_image}"
             except Exception as e:
                 self._log_error(
                     "agent:anthropic",
@@ -481,7 +481,7 @@ class AnthropicAgentClient(BaseMultiStepClient):
                 raise
         
         # Return placeholder if no provider
-        return "data:image/png;base64,placeholder"
+        return "data:image/jpeg;base64,placeholder"
     
     async def capture_screenshot(self, options: Optional[Dict[str, Any]] = None) -> str:
         """
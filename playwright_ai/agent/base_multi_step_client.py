@@ -1,10 +1,12 @@
 """Base class for multi-step agent execution."""
 
 from abc import abstractmethod
-from typing import List, Optional, Dict, Any, TYPE_CHECKING
+from typing import List, Optional, Dict, Any, Tuple, TYPE_CHECKING
+import inspect
 import logging
 
 from .client import AgentClient
+from ..utils.logger import LogLevel
 from ..types.agent import (
     AgentResult,
     AgentExecutionOptions,
@@ -18,6 +20,25 @@ if TYPE_CHECKING:
     from ..utils.logger import PlaywrightAILogger
 
 
+# (logger class, method name) -> whether the method takes (category, message)
+_CATEGORY_STYLE_CACHE: Dict[Tuple[type, str], bool] = {}
+
+
+def _is_category_style(logger: Any, method_name: str) -> bool:
+    """Check a logger method's signature once per logger class."""
+    key = (type(logger), method_name)
+    style = _CATEGORY_STYLE_CACHE.get(key)
+    if style is None:
+        try:
+            # PlaywrightAILogger methods take (category, message, **kwargs)
+            sig = inspect.signature(getattr(logger, method_name))
+            style = len(sig.parameters) >= 2
+        except (TypeError, ValueError):
+            style = False
+        _CATEGORY_STYLE_CACHE[key] = style
+    return style
+
+
 class LoggerMixin:
     """Mixin to handle logger compatibility."""
     
@@ -25,41 +46,40 @@ class LoggerMixin:
         super().__init__(*args, **kwargs)
         self._logger = logger or logging.getLogger(__name__)
     
+    def _info_enabled(self) -> bool:
+        """Whether an info-level message would actually be emitted."""
+        is_enabled_for = getattr(self._logger, 'isEnabledFor', None)
+        if is_enabled_for is not None:
+            return is_enabled_for(logging.INFO)
+        verbose = getattr(self._logger, 'verbose', None)
+        if isinstance(verbose, int):
+            # PlaywrightAILogger drops lines above its verbosity
+            return verbose >= LogLevel.INFO
+        return True
+    
     def _log_info(self, category: str, message: str, **kwargs) -> None:
         """Log info message compatible with both logger types."""
+        if not self._info_enabled():
+            return
         if hasattr(self._logger, 'info'):
-            # Check if it's a PlaywrightAILogger by checking method signature
-            try:
-                # Try PlaywrightAILogger style first
-                import inspect
-                sig = inspect.signature(self._logger.info)
-                if len(sig.parameters) >= 2:
-                    # Looks like PlaywrightAILogger
+            if _is_category_style(self._logger, 'info'):
+                try:
                     self._logger.info(category, message, **kwargs)
-                else:
-                    # Standard logger
-                    self._logger.info(f"[{category}] {message}")
-            except:
-                # Fallback to standard logger format
-                self._logger.info(f"[{category}] {message}")
+                    return
+                except Exception:
+                    pass  # fall back to the standard logger format
+            self._logger.info(f"[{category}] {message}")
     
     def _log_error(self, category: str, message: str, **kwargs) -> None:
         """Log error message compatible with both logger types."""
         if hasattr(self._logger, 'error'):
-            # Check if it's a PlaywrightAILogger by checking method signature
-            try:
-                # Try PlaywrightAILogger style first
-                import inspect
-                sig = inspect.signature(self._logger.error)
-                if len(sig.parameters) >= 2:
-                    # Looks like PlaywrightAILogger
+            if _is_category_style(self._logger, 'error'):
+                try:
                     self._logger.error(category, message, **kwargs)
-                else:
-                    # Standard logger
-                    self._logger.error(f"[{category}] {message}")
-            except:
-                # Fallback to standard logger format
-                self._logger.error(f"[{category}] {message}")
+                    return
+                except Exception:
+                    pass  # fall back to the standard logger format
+            self._logger.error(f"[{category}] {message}")
 
 
 class BaseMultiStepClient(LoggerMixin, AgentClient):
@@ -100,18 +120,23 @@ class BaseMultiStepClient(LoggerMixin, AgentClient):
         total_output_tokens = 0
         total_inference_time = 0
         
-        self._log_info(
-            "agent",
-            f"Starting multi-step execution with instruction: {instruction}"
-        )
+        # Checked once so disabled step logs skip their string formatting
+        info_enabled = self._info_enabled()
+        
+        if info_enabled:
+            self._log_info(
+                "agent",
+                f"Starting multi-step execution with instruction: {instruction}"
+            )
         
         try:
             # Execute steps until completion or max steps reached
             while not completed and current_step < max_steps:
-                self._log_info(
-                    "agent",
-                    f"Executing step {current_step + 1}/{max_steps}"
-                )
+                if info_enabled:
+                    self._log_info(
+                        "agent",
+                        f"Executing step {current_step + 1}/{max_steps}"
+                    )
                 
                 # Execute one step
                 result = await self.execute_step(
@@ -121,17 +146,20 @@ class BaseMultiStepClient(LoggerMixin, AgentClient):
                 )
                 
                 # Accumulate usage metrics
-                if result.get('usage'):
-                    total_input_tokens += result['usage'].get('input_tokens', 0)
-                    total_output_tokens += result['usage'].get('output_tokens', 0)
-                    total_inference_time += result['usage'].get('inference_time_ms', 0)
+                usage = result.get('usage')
+                if usage:
+                    usage_get = usage.get
+                    total_input_tokens += usage_get('input_tokens', 0)
+                    total_output_tokens += usage_get('output_tokens', 0)
+                    total_inference_time += usage_get('inference_time_ms', 0)
                 
                 # Add actions to the list
                 if result['actions']:
-                    self._log_info(
-                        "agent",
-                        f"Step {current_step + 1} performed {len(result['actions'])} actions"
-                    )
+                    if info_enabled:
+                        self._log_info(
+                            "agent",
+                            f"Step {current_step + 1} performed {len(result['actions'])} actions"
+                        )
                     all_actions.extend(result['actions'])
                 
                 # Update completion status
@@ -148,11 +176,12 @@ class BaseMultiStepClient(LoggerMixin, AgentClient):
                 
                 current_step += 1
             
-            self._log_info(
-                "agent",
-                f"Multi-step execution completed: {completed}, "
-                f"with {len(all_actions)} total actions performed"
-            )
+            if info_enabled:
+                self._log_info(
+                    "agent",
+                    f"Multi-step execution completed: {completed}, "
+                    f"with {len(all_actions)} total actions performed"
+                )
             
             # Return the final result
             return AgentResult(
@@ -1,5 +1,6 @@
 """Base agent client implementation."""
 
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, Callable, Awaitable
 from ..types.agent import (
@@ -41,6 +42,8 @@ class AgentClient(ABC):
         self._action_handler: Optional[Callable[[AgentAction], Awaitable[None]]] = None
         self._current_url: Optional[str] = None
         self._viewport: Optional[tuple[int, int]] = None
+        # Post-action screenshot started in the background by the handler
+        self._pending_screenshot: Optional['asyncio.Future[str]'] = None
     
     @abstractmethod
     async def execute(self, options: AgentExecutionOptions) -> AgentResult:
@@ -103,4 +106,21 @@ class AgentClient(ABC):
         Args:
             handler: Async function that executes actions
         """
-        self._action_handler = handler
\ No newline at end of file
+        self._action_handler = handler
+    
+    async def _screenshot_base64(self) -> str:
+        """
+        Get a base64 screenshot, reusing the pending post-action capture.
+        
+        Returns:
+            Base64 screenshot from the screenshot provider
+        """
+        pending = self._pending_screenshot
+        self._pending_screenshot = None
+        if pending is not None and not pending.cancelled():
+            try:
+                return await pending
+            except Exception:
+                # Background capture failed; take a fresh one below
+                pass
+        return await self._screenshot_provider()
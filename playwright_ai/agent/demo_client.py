@@ -1,15 +1,20 @@
 """Demo agent client that uses act/observe/extract internally."""
 
-from typing import Dict, Any, Optional, TYPE_CHECKING, List
+from typing import Dict, Any, Optional, TYPE_CHECKING, List, Tuple
+from itertools import islice
 import logging
 import asyncio
+import hashlib
 import re
+import time
+from enum import IntFlag
 
 from .base_multi_step_client import BaseMultiStepClient
 from ..types.agent import (
     AgentType,
     AgentResult,
     AgentExecutionOptions,
+    AgentExecuteOptions,
     AgentAction,
     ResponseInputItem,
     StepResult,
@@ -20,6 +25,35 @@ if TYPE_CHECKING:
     from ..utils.logger import PlaywrightAILogger
 
 
+# Instruction parsing patterns, compiled once
+_QUOTED_RE = re.compile(r"['\"]([^'\"]+)['\"]")
+_URL_RE = re.compile(r'https?://[^\s]+')
+
+class _Act(IntFlag):
+    """Actions already performed, as recorded in the conversation."""
+    OBSERVE = 1
+    CLICK = 2
+    TYPE = 4
+    NAVIGATE = 8
+
+
+# Tool-result keyword → action it records, first match wins
+_RESULT_ACTIONS = (
+    ("found search box", "observe", _Act.OBSERVE),
+    ("clicked", "click", _Act.CLICK),
+    ("typed", "type", _Act.TYPE),
+    ("navigated", "navigate", _Act.NAVIGATE),
+)
+
+
+# Site keywords recognised in instructions, checked in order
+_SITE_MAP: Dict[str, str] = {
+    "github": "https://github.com",
+    "google": "https://google.com",
+    "stackoverflow": "https://stackoverflow.com",
+}
+
+
 class DemoAgentClient(BaseMultiStepClient):
     """
     Demo agent client implementation with multi-step execution.
@@ -48,10 +82,136 @@ class DemoAgentClient(BaseMultiStepClient):
         self.client_options = client_options
         self.logger = logger or logging.getLogger(__name__)
         self._page = None  # Will be set by handler
+        # Upper bound on waiting for the page to settle after submitting
+        self._post_submit_timeout_ms = 1500
+        # (item count, first item, last item, state) from the last _extract_state call
+        self._state_cache: Optional[Tuple[int, Any, Any, Dict[str, Any]]] = None
+        # observe() results for the current page URL, keyed by (url, instruction)
+        self._observe_cache: Dict[Tuple[str, str], Any] = {}
+        self._observe_cache_url: Optional[str] = None
+        # SHA-256 of the last screenshot returned with dedupe enabled
+        self._last_screenshot_hash: Optional[bytes] = None
+        # (instruction, search query, url) for the instruction parsed last
+        self._parsed_instruction: Optional[Tuple[str, Optional[str], Optional[str]]] = None
+        # Baseline browser round trip, subtracted from reported step time
+        self._network_ping_ms: Optional[int] = None
+        # Queued (instruction, future) pairs for run_batch; created on first use
+        self._inbox: Optional[asyncio.Queue] = None
+        self._batch_latency_ms = 50
+        self._max_batch_size = 16
+    
+    @classmethod
+    async def run_task(
+        cls,
+        context: Any,
+        instruction: str,
+        model_name: str = "demo",
+        client_options: Optional[Dict[str, Any]] = None,
+        max_steps: int = 10,
+        logger: Optional['PlaywrightAILogger'] = None,
+    ) -> AgentResult:
+        """
+        Run one task on its own page with its own client.
+        
+        Nothing is shared between calls, so several tasks can be driven
+        concurrently (e.g. with asyncio.gather, or one call per worker
+        process each owning its own browser context).
+        
+        Args:
+            context: PlaywrightAIContext to open the task's page in
+            instruction: Task instruction
+            model_name: Model name recorded on the client
+            client_options: Client configuration
+            max_steps: Maximum number of steps
+            logger: Logger instance
+            
+        Returns:
+            Agent result for the task
+        """
+        page = await context.new_page()
+        try:
+            client = cls(model_name, client_options or {}, logger=logger)
+            client.set_page(page)
+            return await client.execute(
+                AgentExecutionOptions(
+                    options=AgentExecuteOptions(instruction=instruction, max_steps=max_steps)
+                )
+            )
+        finally:
+            await page.close()
+    
+    async def submit(self, instruction: str, max_steps: int = 10) -> AgentResult:
+        """
+        Queue an instruction for run_batch and wait for its result.
+        
+        Args:
+            instruction: Task instruction
+            max_steps: Maximum number of steps
+            
+        Returns:
+            Agent result for the instruction
+        """
+        if self._inbox is None:
+            self._inbox = asyncio.Queue()
+        future = asyncio.get_running_loop().create_future()
+        await self._inbox.put((instruction, max_steps, future))
+        return await future
+    
+    async def run_batch(self) -> int:
+        """
+        Execute one batch of submitted instructions.
+        
+        Waits for the first instruction, then keeps collecting for up to
+        _batch_latency_ms (at most _max_batch_size items). Identical
+        instructions in the batch run once and share the result; distinct
+        ones run in arrival order on this client's page.
+        
+        Returns:
+            Number of submitted instructions completed
+        """
+        if self._inbox is None:
+            self._inbox = asyncio.Queue()
+        
+        batch = [await self._inbox.get()]
+        deadline = time.perf_counter() + self._batch_latency_ms / 1000
+        while len(batch) < self._max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._inbox.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        
+        # Coalesce duplicates, keeping first-arrival order
+        groups: Dict[Tuple[str, int], List[asyncio.Future]] = {}
+        for instruction, max_steps, future in batch:
+            groups.setdefault((instruction, max_steps), []).append(future)
+        
+        for (instruction, max_steps), futures in groups.items():
+            try:
+                result = await self.execute(
+                    AgentExecutionOptions(
+                        options=AgentExecuteOptions(instruction=instruction, max_steps=max_steps)
+                    )
+                )
+            except Exception as e:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for future in futures:
+                    if not future.done():
+                        future.set_result(result)
+        
+        return len(batch)
     
     def set_page(self, page: Any) -> None:
         """Set the page instance for act/observe/extract."""
         self._page = page
+        self._observe_cache.clear()
+        self._observe_cache_url = None
+        self._network_ping_ms = None  # re-measured on the next step
     
     async def execute_step(
         self,
@@ -63,13 +223,15 @@ class DemoAgentClient(BaseMultiStepClient):
         Execute a single step with multi-step reasoning.
         
         Args:
-            input_items: Conversation history
+            input_items: Conversation history (extended in place)
             previous_response_id: Not used in demo
             logger: Logger instance
             
         Returns:
-            Step result
+            Step result; next_input_items is input_items with this step's items appended
         """
+        step_start = time.perf_counter_ns()
+        
         if not self._page:
             return StepResult(
                 actions=[],
@@ -80,99 +242,43 @@ class DemoAgentClient(BaseMultiStepClient):
                 usage=AgentUsageMetrics(input_tokens=0, output_tokens=0, inference_time_ms=0)
             )
         
+        if self._network_ping_ms is None:
+            await self._measure_network_ping()
+        
         # Extract current state from conversation
         state = self._extract_state(input_items)
         instruction = state.get('instruction', '')
+        instruction_lower = state.get('instruction_lower', '')
         previous_actions = state.get('previous_actions', [])
         
         # Plan next action based on current state
         actions: List[AgentAction] = []
         message = ""
         completed = False
-        next_input_items = list(input_items)
+        # The history is append-only, so extend it in place rather than copying it
+        next_input_items = input_items
         
         try:
             # Analyze what needs to be done next
-            if self._needs_search_box(state):
-                # Observe to find search box
-                self._log_info("agent:demo", "Looking for search box")
-                elements = await self._page.observe("Find the search box")
-                
-                if elements:
-                    actions.append({
-                        "type": "observe",
-                        "description": "Found search box",
-                        "success": True
-                    })
-                    message = "Found search box on page"
-                    
-                    # Add observation result to conversation
-                    next_input_items.append({
-                        "type": "tool_result",
-                        "content": "Found search box element on the page"
-                    })
-                else:
-                    message = "Could not find search box"
-                    completed = True
-                    
-            elif self._needs_click_search(state):
-                # Click on search box
-                self._log_info("agent:demo", "Clicking search box")
-                await self._page.act("Click on the search box")
-                
-                actions.append({
-                    "type": "click",
-                    "target": "search box",
-                    "success": True
-                })
-                message = "Clicked on search box"
-                
-                next_input_items.append({
-                    "type": "tool_result",
-                    "content": "Clicked on search box, ready for input"
-                })
-                
-            elif self._needs_type_query(state):
-                # Type search query
-                query = self._extract_search_query(instruction)
-                if query:
-                    self._log_info("agent:demo", f"Typing search query: {query}")
-                    await self._page.act(f"Type '{query}'")
-                    
-                    actions.append({
-                        "type": "type",
-                        "text": query,
-                        "success": True
-                    })
-                    message = f"Typed search query: {query}"
-                    
-                    next_input_items.append({
-                        "type": "tool_result",
-                        "content": f"Typed '{query}' in search box"
-                    })
-                    
-            elif self._needs_submit(state):
-                # Submit search
-                self._log_info("agent:demo", "Submitting search")
-                await self._page.act("Press Enter")
-                
-                actions.append({
-                    "type": "key",
-                    "key": "Enter",
-                    "success": True
-                })
-                message = "Search submitted successfully"
-                completed = True
-                
-                # Wait for results
-                await asyncio.sleep(1)
+            stage = self._next_stage(state)
+            
+            if stage in self._SEARCH_STAGES:
+                # Run the rest of the search flow in one step instead of one op per step
+                query = self._parse_instruction(instruction, instruction_lower)[0]
+                chained = await self._chain(self._search_ops(stage, query))
+                actions.extend(chained["actions"])
+                next_input_items.extend(chained["results"])
+                message = chained["message"]
+                completed = chained["completed"]
                 
-            elif self._needs_navigation(state):
+            elif stage == "navigate":
                 # Handle navigation
-                url = self._extract_url(instruction)
+                url = self._parse_instruction(instruction, instruction_lower)[1]
                 if url:
-                    self._log_info("agent:demo", f"Navigating to {url}")
+                    if self._info_enabled():
+                        self._log_info("agent:demo", f"Navigating to {url}")
                     await self._page.goto(url)
+                    self._observe_cache.clear()
                     
                     actions.append({
                         "type": "navigate",
@@ -182,7 +288,7 @@ class DemoAgentClient(BaseMultiStepClient):
                     message = f"Navigated to {url}"
                     
                     # Check if more actions needed after navigation
-                    if "search" not in instruction.lower():
+                    if "search" not in instruction_lower:
                         completed = True
                     else:
                         next_input_items.append({
@@ -190,9 +296,19 @@ class DemoAgentClient(BaseMultiStepClient):
                             "content": f"Successfully navigated to {url}"
                         })
                         
+                        # Carry straight on with the search flow on the new page.
+                        # (observe cannot overlap goto: both drive the same page.)
+                        query = self._parse_instruction(instruction, instruction_lower)[0]
+                        chained = await self._chain(self._search_ops("observe", query))
+                        actions.extend(chained["actions"])
+                        next_input_items.extend(chained["results"])
+                        message = chained["message"] or message
+                        completed = chained["completed"]
+                        
             else:
                 # Default action
-                self._log_info("agent:demo", "Executing default action")
+                if self._info_enabled():
+                    self._log_info("agent:demo", "Executing default action")
                 result = await self._page.act(instruction)
                 
                 actions.append({
@@ -215,9 +331,12 @@ class DemoAgentClient(BaseMultiStepClient):
             next_input_items=next_input_items,
             response_id=None,
             usage=AgentUsageMetrics(
-                input_tokens=len(str(input_items)),
+                input_tokens=state["input_chars"],
                 output_tokens=len(message),
-                inference_time_ms=100
+                inference_time_ms=max(
+                    0,
+                    (time.perf_counter_ns() - step_start) // 1_000_000 - (self._network_ping_ms or 0)
+                )
             )
         )
     
@@ -275,138 +394,382 @@ class DemoAgentClient(BaseMultiStepClient):
         # Not used in demo - actions are executed in execute_step
         return []
     
-    def _extract_search_query(self, instruction: str) -> Optional[str]:
-        """Extract search query from instruction."""
+    # Search flow stages, in the order they run
+    _SEARCH_STAGES = ("observe", "click", "type", "submit")
+    
+    # Query-independent search ops, built once and shared by every step
+    _STATIC_SEARCH_OPS: Dict[str, Dict[str, Any]] = {
+        "observe": {
+            "kind": "observe",
+            "instruction": "Find the search box",
+            "log": "Looking for search box",
+            "action": {"type": "observe", "description": "Found search box", "success": True},
+            "message": "Found search box on page",
+            "result": "Found search box element on the page",
+        },
+        "click": {
+            "kind": "act",
+            "instruction": "Click on the search box",
+            "log": "Clicking search box",
+            "action": {"type": "click", "target": "search box", "success": True},
+            "message": "Clicked on search box",
+            "result": "Clicked on search box, ready for input",
+        },
+        "submit": {
+            "kind": "act",
+            "instruction": "Press Enter",
+            "log": "Submitting search",
+            "action": {"type": "key", "key": "Enter", "success": True},
+            "message": "Search submitted successfully",
+            "settle": True,
+            "completes": True,
+        },
+    }
+    
+    def _search_ops(self, start: str, query: Optional[str]) -> List[Dict[str, Any]]:
+        """Build the remaining search-flow ops, beginning at stage ``start``."""
+        ops: List[Dict[str, Any]] = []
+        for stage in self._SEARCH_STAGES[self._SEARCH_STAGES.index(start):]:
+            if stage != "type":
+                ops.append(self._STATIC_SEARCH_OPS[stage])
+                continue
+            if not query:
+                break  # nothing to type yet
+            ops.append({
+                "kind": "act",
+                "instruction": f"Type '{query}'",
+                "log": "Typing search query: %s",
+                "log_args": (query,),
+                "action": {"type": "type", "text": query, "success": True},
+                "message": f"Typed search query: {query}",
+                "result": f"Typed '{query}' in search box",
+            })
+        return ops
+    
+    async def _chain(self, ops: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Run a sequence of browser ops back to back within a single step.
+        
+        Stops at the first op that fails or finds nothing. Every op that ran
+        contributes its action and tool result, so the state extracted from
+        the conversation can resume a partially completed chain.
+        
+        Args:
+            ops: Ops built by _search_ops
+            
+        Returns:
+            Dict with actions, results (tool_result items), message and completed
+        """
+        actions: List[AgentAction] = []
+        results: List[ResponseInputItem] = []
+        message = ""
+        completed = False
+        
+        info_enabled = self._info_enabled()
+        # set once the observed element was filled and submitted directly
+        prefilled = False
+        for index, op in enumerate(ops):
+            if info_enabled and not prefilled:
+                # %-style args are only formatted when the line is actually logged
+                log_args = op.get("log_args")
+                self._log_info("agent:demo", op["log"] % log_args if log_args else op["log"])
+            try:
+                if op["kind"] == "observe":
+                    elements = await self._observe(op["instruction"])
+                    if not elements:
+                        message = "Could not find search box"
+                        completed = True
+                        break
+                    prefilled = await self._fill_and_submit(elements, ops[index + 1:])
+                elif not prefilled:
+                    await self._page.act(op["instruction"])
+            except Exception as e:
+                self._log_error("agent:demo", f"Error in step: {e}")
+                message = f"Error: {str(e)}"
+                completed = True
+                break
+            
+            # fresh copy: the shared op templates must never leak into results
+            actions.append(AgentAction(**op["action"]))
+            message = op["message"]
+            if op.get("result"):
+                results.append({"type": "tool_result", "content": op["result"]})
+            
+            if op.get("settle"):
+                # Wait for results: return as soon as the network settles, capped
+                try:
+                    await self._page.wait_for_load_state(
+                        "networkidle", timeout=self._post_submit_timeout_ms
+                    )
+                except Exception:
+                    pass
+            
+            if op.get("completes"):
+                completed = True
+        
+        return {
+            "actions": actions,
+            "results": results,
+            "message": message,
+            "completed": completed,
+        }
+    
+    async def _measure_network_ping(self) -> None:
+        """Time one trivial page.evaluate round trip as the transit baseline."""
+        try:
+            start = time.perf_counter_ns()
+            await self._page.evaluate("() => performance.now()")
+            self._network_ping_ms = (time.perf_counter_ns() - start) // 1_000_000
+        except Exception:
+            self._network_ping_ms = 0
+    
+    async def _observe(self, instruction: str) -> Any:
+        """observe() that reuses earlier results while the page URL is unchanged."""
+        url = self._page.url
+        if url != self._observe_cache_url:
+            self._observe_cache.clear()
+            self._observe_cache_url = url
+        
+        key = (url, instruction)
+        elements = self._observe_cache.get(key)
+        if not elements:
+            elements = await self._page.observe(instruction)
+            if elements:
+                # only hits are kept; a miss may succeed once the page finishes loading
+                self._observe_cache[key] = elements
+        return elements
+    
+    def _parse_instruction(
+        self,
+        instruction: str,
+        instruction_lower: Optional[str] = None
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Return the (search query, url) for an instruction.
+        
+        The instruction is fixed for a whole task, so it is parsed once and
+        reused by every step instead of re-running the extractors each time.
+        """
+        parsed = self._parsed_instruction
+        if parsed is None or parsed[0] != instruction:
+            parsed = (
+                instruction,
+                self._extract_search_query(instruction, instruction_lower),
+                self._extract_url(instruction, instruction_lower),
+            )
+            self._parsed_instruction = parsed
+        return parsed[1], parsed[2]
+    
+    async def _fill_and_submit(self, elements: Any, rest: List[Dict[str, Any]]) -> bool:
+        """
+        Fill and submit the observed search box directly when the rest of the
+        chain is exactly click → type → submit.
+        
+        Replaces three act() round trips with two locator calls on the
+        observed element. Returns False (leaving the act-based ops to run)
+        when there is no usable selector or the direct path fails.
+        """
+        if [op["action"]["type"] for op in rest] != ["click", "type", "key"]:
+            return False
+        selector = getattr(elements[0], "selector", None)
+        if not selector or selector == "xpath=":
+            return False
+        
+        query = rest[1]["action"]["text"]
+        locator = None
+        try:
+            locator = self._page.locator(selector).first
+            await locator.fill(query)  # focuses the element, like the click would
+            await locator.press("Enter")
+        except Exception as e:
+            self._log_error("agent:demo", f"Direct fill failed, falling back to act: {e}")
+            if locator is not None:
+                try:
+                    await locator.fill("")  # don't let the act-based typing double up
+                except Exception:
+                    pass
+            return False
+        
+        if self._info_enabled():
+            self._log_info("agent:demo", "Filled and submitted search box directly")
+        return True
+    
+    def _extract_search_query(
+        self,
+        instruction: str,
+        instruction_lower: Optional[str] = None
+    ) -> Optional[str]:
+        """Extract search query from instruction (``instruction_lower`` if already computed)."""
         # Simple extraction - look for quoted text
-        quoted = re.findall(r"['\"]([^'\"]+)['\"]", instruction)
+        quoted = _QUOTED_RE.search(instruction)
         if quoted:
-            return quoted[0]
+            return quoted.group(1)
         
         # Or extract after "for"
         if " for " in instruction:
             return instruction.split(" for ", 1)[1].strip()
         
         # Or extract after "search"
-        if "search" in instruction.lower():
-            parts = instruction.lower().split("search")
+        if instruction_lower is None:
+            instruction_lower = instruction.lower()
+        if "search" in instruction_lower:
+            parts = instruction_lower.split("search")
             if len(parts) > 1:
                 return parts[1].strip().strip("'\"")
         
         return None
     
     def _extract_state(self, input_items: List[ResponseInputItem]) -> Dict[str, Any]:
-        """Extract current state from conversation history."""
-        state = {
-            "instruction": "",
-            "previous_actions": [],
-            "last_result": None
-        }
+        """
+        Extract current state from conversation history.
+        
+        The history only ever grows by appending, so when it still starts
+        with the items seen last time only the new tail is parsed.
+        """
+        start = 0
+        cache = self._state_cache
+        if cache is not None:
+            count, first, last, cached = cache
+            if (
+                count <= len(input_items)
+                and input_items[0] is first
+                and input_items[count - 1] is last
+            ):
+                state = {**cached, "previous_actions": list(cached["previous_actions"])}
+                start = count
+        
+        if not start:
+            state = {
+                "instruction": "",
+                "instruction_lower": "",
+                "previous_actions": [],
+                "done": _Act(0),
+                "last_result": None,
+                "last_result_lower": "",
+                "input_chars": 0
+            }
         
-        for item in input_items:
-            if item.get("role") == "user" and item.get("content"):
+        # Accumulate into locals and write the state back once at the end
+        input_chars = state["input_chars"]
+        done = state["done"]
+        previous_actions = state["previous_actions"]
+        
+        for item in islice(input_items, start, None):
+            get = item.get
+            raw = get("content", "")
+            text = raw if type(raw) is str else str(raw)
+            # Running size of the history, in content characters
+            input_chars += len(text)
+            
+            if get("role") == "user" and raw:
                 # Get the original instruction
                 if not state["instruction"]:
-                    state["instruction"] = str(item["content"])
-            elif item.get("type") == "tool_result":
+                    state["instruction"] = text
+                    state["instruction_lower"] = text.lower()
+            elif get("type") == "tool_result":
                 # Track previous results
-                state["last_result"] = item.get("content")
+                state["last_result"] = raw
                 
-                # Parse actions from results
-                content = str(item.get("content", "")).lower()
-                if "found search box" in content:
-                    state["previous_actions"].append("observe")
-                elif "clicked" in content:
-                    state["previous_actions"].append("click")
-                elif "typed" in content:
-                    state["previous_actions"].append("type")
-                elif "navigated" in content:
-                    state["previous_actions"].append("navigate")
+                # Parse actions from results (lowercased once, reused by the predicates)
+                content = text.lower()
+                state["last_result_lower"] = content
+                for keyword, action, flag in _RESULT_ACTIONS:
+                    if keyword in content:
+                        previous_actions.append(action)
+                        done |= flag
+                        break
         
+        state["input_chars"] = input_chars
+        state["done"] = done
+        
+        if input_items:
+            self._state_cache = (len(input_items), input_items[0], input_items[-1], state)
         return state
     
-    def _needs_search_box(self, state: Dict[str, Any]) -> bool:
-        """Check if we need to find search box."""
-        instruction = state.get("instruction", "").lower()
-        previous = state.get("previous_actions", [])
-        
-        return (
-            "search" in instruction and
-            "observe" not in previous and
-            "navigate" not in instruction
-        )
-    
-    def _needs_click_search(self, state: Dict[str, Any]) -> bool:
-        """Check if we need to click search box."""
-        previous = state.get("previous_actions", [])
-        last_result = str(state.get("last_result", "")).lower()
-        
-        return (
-            "observe" in previous and
-            "click" not in previous and
-            "found search box" in last_result
-        )
+    # Next-stage rules, first match wins:
+    # (stage, action that must be done, action that must not be done,
+    #  last-result flag, instruction flag)
+    _STAGE_RULES = (
+        ("observe", _Act(0), _Act.OBSERVE, None, "search_here"),
+        ("click", _Act.OBSERVE, _Act.CLICK, "found", None),
+        ("type", _Act.CLICK, _Act.TYPE, "clicked", None),
+        ("submit", _Act.TYPE, _Act(0), "typed", None),
+        ("navigate", _Act(0), _Act.NAVIGATE, None, "navigate"),
+    )
     
-    def _needs_type_query(self, state: Dict[str, Any]) -> bool:
-        """Check if we need to type search query."""
-        previous = state.get("previous_actions", [])
-        last_result = str(state.get("last_result", "")).lower()
-        
-        return (
-            "click" in previous and
-            "type" not in previous and
-            ("clicked" in last_result or "ready for input" in last_result)
-        )
-    
-    def _needs_submit(self, state: Dict[str, Any]) -> bool:
-        """Check if we need to submit search."""
-        previous = state.get("previous_actions", [])
-        last_result = str(state.get("last_result", "")).lower()
-        
-        return (
-            "type" in previous and
-            "typed" in last_result
-        )
-    
-    def _needs_navigation(self, state: Dict[str, Any]) -> bool:
-        """Check if we need to navigate."""
-        instruction = state.get("instruction", "").lower()
-        previous = state.get("previous_actions", [])
-        
-        return (
-            ("navigate" in instruction or "go to" in instruction) and
-            "navigate" not in previous
-        )
+    def _next_stage(self, state: Dict[str, Any]) -> Optional[str]:
+        """Pick the next stage from the conversation state, or None for the default action."""
+        instruction = state.get("instruction_lower", "")
+        last_result = state.get("last_result_lower", "")
+        done_mask = state.get("done", _Act(0))
+        
+        # Every condition the rules refer to, evaluated once
+        flags = {
+            "search_here": "search" in instruction and "navigate" not in instruction,
+            "navigate": "navigate" in instruction or "go to" in instruction,
+            "found": "found search box" in last_result,
+            "clicked": "clicked" in last_result or "ready for input" in last_result,
+            "typed": "typed" in last_result,
+        }
+        
+        for stage, done, not_done, result_flag, instruction_flag in self._STAGE_RULES:
+            if done & ~done_mask:
+                continue
+            if not_done & done_mask:
+                continue
+            if result_flag and not flags[result_flag]:
+                continue
+            if instruction_flag and not flags[instruction_flag]:
+                continue
+            return stage
+        return None
     
-    def _extract_url(self, instruction: str) -> Optional[str]:
+    def _extract_url(
+        self,
+        instruction: str,
+        instruction_lower: Optional[str] = None
+    ) -> Optional[str]:
         """Extract URL from instruction."""
-        instruction_lower = instruction.lower()
+        if instruction_lower is None:
+            instruction_lower = instruction.lower()
         
         # Check for common sites
-        if "github" in instruction_lower:
-            return "https://github.com"
-        elif "google" in instruction_lower:
-            return "https://google.com"
-        elif "stackoverflow" in instruction_lower:
-            return "https://stackoverflow.com"
+        for keyword, site_url in _SITE_MAP.items():
+            if keyword in instruction_lower:
+                return site_url
         
         # Look for URLs
-        url_pattern = re.compile(r'https?://[^\s]+')  
-        urls = url_pattern.findall(instruction)
-        if urls:
-            return urls[0]
-        
-        return None
+        # Stop at the first URL instead of collecting all of them
+        match = _URL_RE.search(instruction)
+        return match.group(0) if match else None
     
     async def capture_screenshot(self, options: Optional[Dict[str, Any]] = None) -> Any:
         """
         Capture a screenshot.
         
         Args:
-            options: Screenshot options
+            options: Screenshot options. ``nowait`` returns an asyncio.Task
+                so the capture overlaps whatever the caller does next;
+                ``dedupe`` returns "unchanged" when the image matches the
+                previous deduplicated capture.
             
         Returns:
-            Screenshot data
+            Screenshot data, "unchanged", a Task resolving to either, or None
         """
-        if self._screenshot_provider:
-            return await self._screenshot_provider()
-        return None
\ No newline at end of file
+        if not self._screenshot_provider:
+            return None
+        
+        options = options or {}
+        if options.get("nowait"):
+            return asyncio.create_task(
+                self.capture_screenshot({**options, "nowait": False})
+            )
+        
+        screenshot = await self._screenshot_base64()
+        if options.get("dedupe") and screenshot is not None:
+            data = screenshot.encode() if isinstance(screenshot, str) else screenshot
+            digest = hashlib.sha256(data).digest()
+            if digest == self._last_screenshot_hash:
+                return "unchanged"
+            self._last_screenshot_hash = digest
+        return screenshot
@@ -1,7 +1,7 @@
 """Agent handler for PlaywrightAIPage integration."""
 
 import asyncio
-from typing import Union, TYPE_CHECKING, Optional, Dict, Any
+from typing import Union, TYPE_CHECKING, Optional, Dict, Any, Callable, Awaitable, Tuple
 import base64
 
 from ..types.agent import (
@@ -21,12 +21,164 @@ if TYPE_CHECKING:
     from ..utils.logger import PlaywrightAILogger
 
 
+# Map of common key names (upper-cased) to Playwright key names
+_KEY_MAP: Dict[str, str] = {
+    "ENTER": "Enter",
+    "RETURN": "Enter",
+    "ESCAPE": "Escape",
+    "ESC": "Escape",
+    "BACKSPACE": "Backspace",
+    "TAB": "Tab",
+    "SPACE": " ",
+    "ARROWUP": "ArrowUp",
+    "ARROWDOWN": "ArrowDown",
+    "ARROWLEFT": "ArrowLeft",
+    "ARROWRIGHT": "ArrowRight",
+    "UP": "ArrowUp",
+    "DOWN": "ArrowDown",
+    "LEFT": "ArrowLeft",
+    "RIGHT": "ArrowRight",
+    "DELETE": "Delete",
+    "DEL": "Delete",
+    "HOME": "Home",
+    "END": "End",
+    "PAGEUP": "PageUp",
+    "PAGEDOWN": "PageDown",
+    "SHIFT": "Shift",
+    "CONTROL": "Control",
+    "CTRL": "Control",
+    "ALT": "Alt",
+    "META": "Meta",
+    "COMMAND": "Meta",
+    "CMD": "Meta",
+}
+
+# Keys that are already valid Playwright names
+_KEY_PASSTHROUGH = frozenset(_KEY_MAP.values())
+
+
+# Scroll expression kept constant so the page can reuse the compiled source;
+# the offsets are passed as the evaluate argument
+_SCROLL_BY_JS = "([x, y]) => window.scrollBy(x, y)"
+
+# Unit scroll vectors for legacy direction-based scrolling
+_SCROLL_VECTORS: Dict[str, Tuple[int, int]] = {
+    'down': (0, 1),
+    'up': (0, -1),
+    'right': (1, 0),
+    'left': (-1, 0),
+}
+
+
+# Cursor and highlight overlay; installs itself once per document
+_CURSOR_JS = """
+(function install() {
+    // Init scripts also run in child frames; only the top page gets a cursor
+    if (window !== window.top) return;
+    
+    // Already installed in this document
+    if (document.getElementById('playwright_ai-cursor')) return;
+    
+    // Init scripts run before <body> exists; retry once it does
+    if (!document.body) {
+        document.addEventListener('DOMContentLoaded', install, { once: true });
+        return;
+    }
+    
+    // Create cursor element
+    const cursor = document.createElement('div');
+    cursor.id = 'playwright_ai-cursor';
+    
+    // Use SVG for custom cursor
+    cursor.innerHTML = `
+    <svg xmlns="http://www.w3.org/2000/svg" version="1.1" viewBox="0 0 28 28" width="28" height="28">
+        <polygon fill="#000000" points="9.2,7.3 9.2,18.5 12.2,15.6 12.6,15.5 17.4,15.5"/>
+        <rect x="12.5" y="13.6" transform="matrix(0.9221 -0.3871 0.3871 0.9221 -5.7605 6.5909)" width="2" height="8" fill="#000000"/>
+    </svg>
+    `;
+    
+    // Style the cursor
+    cursor.style.position = 'absolute';
+    cursor.style.top = '0';
+    cursor.style.left = '0';
+    cursor.style.width = '28px';
+    cursor.style.height = '28px';
+    cursor.style.pointerEvents = 'none';
+    cursor.style.zIndex = '9999999';
+    cursor.style.transform = 'translate(-4px, -4px)';
+    
+    // Create highlight element for click animation
+    const highlight = document.createElement('div');
+    highlight.id = 'playwright_ai-highlight';
+    highlight.style.position = 'absolute';
+    highlight.style.width = '20px';
+    highlight.style.height = '20px';
+    highlight.style.borderRadius = '50%';
+    highlight.style.backgroundColor = 'rgba(66, 134, 244, 0)';
+    highlight.style.transform = 'translate(-50%, -50%) scale(0)';
+    highlight.style.pointerEvents = 'none';
+    highlight.style.zIndex = '9999998';
+    highlight.style.transition = 'transform 0.3s ease-out, opacity 0.3s ease-out';
+    highlight.style.opacity = '0';
+    
+    // Add elements to document
+    document.body.appendChild(cursor);
+    document.body.appendChild(highlight);
+    
+    // Add functions to window
+    window.__updateCursorPosition = function(x, y) {
+        if (cursor) {
+            cursor.style.transform = `translate(${x - 4}px, ${y - 4}px)`;
+        }
+    };
+    
+    window.__animateClick = function(x, y) {
+        if (highlight) {
+            highlight.style.left = `${x}px`;
+            highlight.style.top = `${y}px`;
+            highlight.style.transform = 'translate(-50%, -50%) scale(1)';
+            highlight.style.opacity = '1';
+            
+            setTimeout(() => {
+                highlight.style.transform = 'translate(-50%, -50%) scale(0)';
+                highlight.style.opacity = '0';
+            }, 300);
+        }
+    };
+})();
+"""
+
+# Whether the cursor overlay is present in the current document
+_CURSOR_EXISTS_JS = "!!document.getElementById('playwright_ai-cursor')"
+
+
+# Action types that move or click the pointer and so show the cursor
+_CURSOR_ACTIONS = frozenset({
+    'click', 'double_click', 'doubleclick', 'scroll', 'drag', 'move',
+})
+
+
 class AgentHandler:
     """
     Handler for agent operations on a page.
     
     Integrates agent functionality with PlaywrightAIPage.
     """
+    __slots__ = (
+        "playwright_ai",
+        "ai_browser_automation_page",
+        "logger",
+        "options",
+        "provider",
+        "agent_client",
+        "agent",
+        "_wait_s",
+        "_visual",
+        "_cursor_registered",
+        "_cursor_injected",
+        "_dispatch",
+        "_nav_listener",
+    )
     
     def __init__(
         self,
@@ -49,6 +201,47 @@ class AgentHandler:
         self.logger = logger
         self.options = options
         
+        # Delay after each action, in seconds (client_options value is ms)
+        client_options = options.client_options
+        self._wait_s = (
+            client_options.get('wait_between_actions', 1000) / 1000
+            if client_options
+            else 1.0
+        )
+        
+        # Cursor overlay and animation pauses only matter when someone can
+        # watch the browser; headless runs skip them unless asked for
+        self._visual = bool(
+            client_options.get('visual_feedback', not playwright_ai.config.headless)
+            if client_options
+            else not playwright_ai.config.headless
+        )
+        
+        # Whether the cursor script is registered as a page init script
+        self._cursor_registered = False
+        # Whether the current document is known to have the cursor; reset
+        # on navigation
+        self._cursor_injected = False
+        
+        # Action type -> handler, looked up once per action
+        self._dispatch: Dict[str, Callable[[AgentAction], Awaitable[None]]] = {
+            'click': self._do_click,
+            'double_click': self._do_double_click,
+            'doubleclick': self._do_double_click,
+            'type': self._do_type,
+            'fill': self._do_fill,
+            'key': self._do_key,
+            'keypress': self._do_key,
+            'scroll': self._do_scroll,
+            'drag': self._do_drag,
+            'move': self._do_move,
+            'wait': self._do_wait,
+            'screenshot': self._do_screenshot,
+            'navigate': self._do_navigate,
+            'goto': self._do_navigate,
+            'function': self._do_function,
+        }
+        
         # Initialize provider
         self.provider = AgentProvider(logger)
         
@@ -72,49 +265,38 @@ class AgentHandler:
     def _setup_agent_client(self) -> None:
         """Set up agent client with page-specific functionality."""
         # Set up screenshot provider
-        async def screenshot_provider() -> str:
-            """Take screenshot and return as base64."""
-            screenshot_bytes = await self.ai_browser_automation_page.screenshot(full_page=False)
-            return base64.b64encode(screenshot_bytes).decode('utf-8')
-        
-        self.agent_client.set_screenshot_provider(screenshot_provider)
+        self.agent_client.set_screenshot_provider(self._take_screenshot)
         
         # Set up action handler
         async def action_handler(action: AgentAction) -> None:
             """Execute an action on the page."""
-            # Default delay between actions
-            default_delay = 1000
-            wait_between_actions = (
-                self.options.client_options.get('wait_between_actions', default_delay)
-                if self.options.client_options
-                else default_delay
-            )
+            # Normalise the type once for both the cursor check and dispatch
+            action_type = action.get('type')
+            action_type = action_type.lower() if action_type else ''
             
             try:
-                # Try to inject cursor before action
-                try:
-                    await self._inject_cursor()
-                except Exception:
-                    # Ignore cursor injection failures
-                    pass
-                
-                # Small delay before action for visibility
-                await asyncio.sleep(0.5)
+                if self._visual:
+                    if action_type in _CURSOR_ACTIONS:
+                        # Inject cursor during the small pre-action delay for
+                        # visibility rather than before it
+                        try:
+                            await asyncio.gather(self._ensure_cursor(), asyncio.sleep(0.5))
+                        except Exception:
+                            # Ignore cursor injection failures
+                            pass
+                    else:
+                        # Small delay before action for visibility
+                        await asyncio.sleep(0.5)
                 
                 # Execute the action
-                await self._execute_action(action)
+                await self._execute_action(action, action_type)
                 
                 # Delay after action
-                await asyncio.sleep(wait_between_actions / 1000)
+                await asyncio.sleep(self._wait_s)
                 
-                # Take screenshot after action
-                try:
-                    await self._capture_and_send_screenshot()
-                except Exception as e:
-                    self.logger.warn(
-                        "agent",
-                        f"Failed to take screenshot after action: {e}. Continuing execution."
-                    )
+                # Take screenshot after action in the background; the agent
+                # client awaits it when it builds the next request
+                self._schedule_screenshot()
             
             except Exception as e:
                 self.logger.error(
@@ -128,6 +310,24 @@ class AgentHandler:
         # Update viewport and URL
         self._update_client_viewport()
         self._update_client_url()
+        
+        # Keep them current on every navigation, including ones triggered
+        # by clicks and form submits rather than navigate actions
+        # (one bound method kept so close() can remove the same listener)
+        self._nav_listener = self._on_frame_navigated
+        self.ai_browser_automation_page.on("framenavigated", self._nav_listener)
+    
+    def close(self) -> None:
+        """Stop tracking the page's navigations. Safe to call more than once."""
+        listener = self._nav_listener
+        if listener is None:
+            return
+        self._nav_listener = None
+        try:
+            self.ai_browser_automation_page.remove_listener("framenavigated", listener)
+        except Exception:
+            # Page already closed; nothing left to detach from
+            pass
     
     async def execute(
         self,
@@ -165,178 +365,30 @@ class AgentHandler:
         # Execute through agent
         return await self.agent.execute(options)
     
-    async def _execute_action(self, action: AgentAction) -> ActionExecutionResult:
+    async def _execute_action(
+        self,
+        action: AgentAction,
+        action_type: Optional[str] = None,
+    ) -> ActionExecutionResult:
         """
         Execute a single action on the page.
         
         Args:
             action: Action to execute
+            action_type: Lower-cased action type, if already known
             
         Returns:
             Action execution result
         """
         try:
-            action_type = action.get('type', '').lower()
+            if action_type is None:
+                action_type = action.get('type')
+                action_type = action_type.lower() if action_type else ''
             
-            if action_type == 'click':
-                # Enhanced click with position and button support
-                x = action.get('x')
-                y = action.get('y')
-                button = action.get('button', 'left')
-                selector = action.get('selector')
-                
-                if x is not None and y is not None:
-                    # Update cursor position first
-                    await self._update_cursor_position(x, y)
-                    # Animate the click
-                    await self._animate_click(x, y)
-                    # Small delay to see animation
-                    await asyncio.sleep(0.3)
-                    # Perform actual click
-                    await self.ai_browser_automation_page.mouse.click(x, y, button=button)
-                elif selector:
-                    await self.ai_browser_automation_page.click(selector)
-                else:
-                    raise ValueError("Click action requires either x/y coordinates or selector")
-                    
-            elif action_type in ['double_click', 'doubleclick']:
-                # Double click support
-                x = action.get('x', 0)
-                y = action.get('y', 0)
-                
-                # Update cursor position
-                await self._update_cursor_position(x, y)
-                # Animate both clicks
-                await self._animate_click(x, y)
-                await asyncio.sleep(0.2)
-                await self._animate_click(x, y)
-                await asyncio.sleep(0.2)
-                # Perform double click
-                await self.ai_browser_automation_page.mouse.dblclick(x, y)
-                
-            elif action_type == 'type':
-                # Type text
-                text = action.get('text', '')
-                await self.ai_browser_automation_page.keyboard.type(text)
-                
-            elif action_type == 'fill':
-                # Fill form field
-                selector = action.get('selector', '')
-                text = action.get('text', '')
-                if selector:
-                    await self.ai_browser_automation_page.fill(selector, text)
-                else:
-                    # If no selector, just type
-                    await self.ai_browser_automation_page.keyboard.type(text)
-                    
-            elif action_type in ['key', 'keypress']:
-                # Handle key press
-                key = action.get('key') or action.get('text', '')
-                keys = action.get('keys', [])
-                
-                if keys:
-                    # Handle multiple keys
-                    for k in keys:
-                        mapped_key = self._convert_key_name(k)
-                        await self.ai_browser_automation_page.keyboard.press(mapped_key)
-                elif key:
-                    # Single key
-                    mapped_key = self._convert_key_name(key)
-                    await self.ai_browser_automation_page.keyboard.press(mapped_key)
-                    
-            elif action_type == 'scroll':
-                # Enhanced scroll with x/y support
-                x = action.get('x', 0)
-                y = action.get('y', 0)
-                scroll_x = action.get('scroll_x', 0)
-                scroll_y = action.get('scroll_y', 0)
-                
-                # Move to position first
-                if x or y:
-                    await self.ai_browser_automation_page.mouse.move(x, y)
-                
-                # Scroll
-                if scroll_x or scroll_y:
-                    await self.ai_browser_automation_page.evaluate(
-                        f"window.scrollBy({scroll_x}, {scroll_y})"
-                    )
-                elif action.get('direction'):
-                    # Legacy direction-based scrolling
-                    direction = action.get('direction', 'down')
-                    amount = action.get('amount', 100)
-                    if direction == 'down':
-                        await self.ai_browser_automation_page.evaluate(f"window.scrollBy(0, {amount})")
-                    elif direction == 'up':
-                        await self.ai_browser_automation_page.evaluate(f"window.scrollBy(0, -{amount})")
-                    elif direction == 'right':
-                        await self.ai_browser_automation_page.evaluate(f"window.scrollBy({amount}, 0)")
-                    elif direction == 'left':
-                        await self.ai_browser_automation_page.evaluate(f"window.scrollBy(-{amount}, 0)")
-                        
-            elif action_type == 'drag':
-                # Drag with path support
-                path = action.get('path', [])
-                if len(path) >= 2:
-                    start = path[0]
-                    
-                    # Update cursor for start
-                    await self._update_cursor_position(start['x'], start['y'])
-                    await self.ai_browser_automation_page.mouse.move(start['x'], start['y'])
-                    await self.ai_browser_automation_page.mouse.down()
-                    
-                    # Move through path
-                    for point in path[1:]:
-                        await self._update_cursor_position(point['x'], point['y'])
-                        await self.ai_browser_automation_page.mouse.move(point['x'], point['y'])
-                    
-                    await self.ai_browser_automation_page.mouse.up()
-                else:
-                    raise ValueError("Drag action requires path with at least 2 points")
-                    
-            elif action_type == 'move':
-                # Move cursor
-                x = action.get('x', 0)
-                y = action.get('y', 0)
-                await self._update_cursor_position(x, y)
-                await self.ai_browser_automation_page.mouse.move(x, y)
-                
-            elif action_type == 'wait':
-                # Wait action
-                timeout = action.get('timeout', 1000)
-                await asyncio.sleep(timeout / 1000)
-                
-            elif action_type == 'screenshot':
-                # Screenshot is handled automatically by agent client
-                await self._capture_and_send_screenshot()
-                
-            elif action_type in ['navigate', 'goto']:
-                # Navigation
-                url = action.get('url', '')
-                await self.ai_browser_automation_page.goto(url)
-                self._update_client_url()
-                
-            elif action_type == 'function':
-                # Function calls
-                name = action.get('name', '')
-                args = action.get('arguments', {})
-                
-                if name == 'goto' and 'url' in args:
-                    await self.ai_browser_automation_page.goto(args['url'])
-                    self._update_client_url()
-                elif name == 'back':
-                    await self.ai_browser_automation_page.go_back()
-                    self._update_client_url()
-                elif name == 'forward':
-                    await self.ai_browser_automation_page.go_forward()
-                    self._update_client_url()
-                elif name == 'reload':
-                    await self.ai_browser_automation_page.reload()
-                    self._update_client_url()
-                else:
-                    raise ValueError(f"Unsupported function: {name}")
-                    
-            else:
+            handler = self._dispatch.get(action_type)
+            if handler is None:
                 raise ValueError(f"Unknown action type: {action_type}")
+            await handler(action)
             
             return ActionExecutionResult(success=True)
             
@@ -350,86 +402,196 @@ class AgentHandler:
                 error=str(e)
             )
     
-    async def _inject_cursor(self) -> None:
-        """Inject cursor visualization into the page."""
+    async def _do_click(self, action: AgentAction) -> None:
+        """Enhanced click with position and button support."""
+        page = self.ai_browser_automation_page
+        x = action.get('x')
+        y = action.get('y')
+        button = action.get('button', 'left')
+        selector = action.get('selector')
+        
+        if x is not None and y is not None:
+            if self._visual:
+                # Move the cursor and animate the click in one round-trip
+                await self._show_click(x, y)
+                # Small delay to see animation
+                await asyncio.sleep(0.3)
+            # Perform actual click
+            await page.mouse.click(x, y, button=button)
+        elif selector:
+            await page.click(selector)
+        else:
+            raise ValueError("Click action requires either x/y coordinates or selector")
+    
+    async def _do_double_click(self, action: AgentAction) -> None:
+        """Double click support."""
+        mouse = self.ai_browser_automation_page.mouse
+        x = action.get('x', 0)
+        y = action.get('y', 0)
+        
+        if self._visual:
+            # Move the cursor and animate both clicks in one round-trip; the
+            # second animation is scheduled in the page 200 ms later, so the
+            # double click lands as it starts
+            await self._show_click(x, y, clicks=2)
+            await asyncio.sleep(0.2)
+        # Perform double click
+        await mouse.dblclick(x, y)
+    
+    async def _do_type(self, action: AgentAction) -> None:
+        """Type text."""
+        keyboard = self.ai_browser_automation_page.keyboard
+        text = action.get('text', '')
+        await keyboard.type(text)
+    
+    async def _do_fill(self, action: AgentAction) -> None:
+        """Fill form field."""
+        page = self.ai_browser_automation_page
+        selector = action.get('selector', '')
+        text = action.get('text', '')
+        if selector:
+            await page.fill(selector, text)
+        else:
+            # If no selector, just type
+            await page.keyboard.type(text)
+    
+    async def _do_key(self, action: AgentAction) -> None:
+        """Handle key press."""
+        keyboard = self.ai_browser_automation_page.keyboard
+        keys = action.get('keys')
+        
+        if keys:
+            # Handle multiple keys
+            for k in keys:
+                mapped_key = self._convert_key_name(k)
+                await keyboard.press(mapped_key)
+            return
+        
+        key = action.get('key') or action.get('text')
+        if key:
+            # Single key
+            mapped_key = self._convert_key_name(key)
+            await keyboard.press(mapped_key)
+    
+    async def _do_scroll(self, action: AgentAction) -> None:
+        """Enhanced scroll with x/y support."""
+        page = self.ai_browser_automation_page
+        x = action.get('x', 0)
+        y = action.get('y', 0)
+        scroll_x = action.get('scroll_x', 0)
+        scroll_y = action.get('scroll_y', 0)
+        direction = action.get('direction')
+        
+        # Move to position first
+        if x or y:
+            await page.mouse.move(x, y)
+        
+        # Scroll
+        if scroll_x or scroll_y:
+            await page.evaluate(_SCROLL_BY_JS, [scroll_x, scroll_y])
+        elif direction:
+            # Legacy direction-based scrolling
+            amount = action.get('amount', 100)
+            vector = _SCROLL_VECTORS.get(direction)
+            if vector:
+                dx, dy = vector
+                await page.evaluate(
+                    _SCROLL_BY_JS, [dx * amount, dy * amount]
+                )
+    
+    async def _do_drag(self, action: AgentAction) -> None:
+        """Drag with path support."""
+        mouse = self.ai_browser_automation_page.mouse
+        path = action.get('path', [])
+        if len(path) >= 2:
+            start = path[0]
+            
+            # Update cursor for start
+            if self._visual:
+                await self._update_cursor_position(start['x'], start['y'])
+            await mouse.move(start['x'], start['y'])
+            await mouse.down()
+            
+            # Move through path
+            if self._visual:
+                # Overlap each overlay update with its real mouse move
+                for point in path[1:]:
+                    px, py = point['x'], point['y']
+                    await asyncio.gather(
+                        self._update_cursor_position(px, py),
+                        mouse.move(px, py),
+                    )
+            else:
+                for point in path[1:]:
+                    await mouse.move(point['x'], point['y'])
+            
+            await mouse.up()
+        else:
+            raise ValueError("Drag action requires path with at least 2 points")
+    
+    async def _do_move(self, action: AgentAction) -> None:
+        """Move cursor."""
+        mouse = self.ai_browser_automation_page.mouse
+        x = action.get('x', 0)
+        y = action.get('y', 0)
+        if self._visual:
+            await self._update_cursor_position(x, y)
+        await mouse.move(x, y)
+    
+    async def _do_wait(self, action: AgentAction) -> None:
+        """Wait action."""
+        timeout = action.get('timeout', 1000)
+        await asyncio.sleep(timeout / 1000)
+    
+    async def _do_screenshot(self, action: AgentAction) -> None:
+        """Screenshot is handled automatically by agent client."""
+        await self._capture_and_send_screenshot()
+    
+    async def _do_navigate(self, action: AgentAction) -> None:
+        """Navigation."""
+        url = action.get('url', '')
+        await self.ai_browser_automation_page.goto(url)
+    
+    async def _do_function(self, action: AgentAction) -> None:
+        """Function calls."""
+        page = self.ai_browser_automation_page
+        name = action.get('name', '')
+        args = action.get('arguments', {})
+        
+        if name == 'goto' and 'url' in args:
+            await page.goto(args['url'])
+        elif name == 'back':
+            await page.go_back()
+        elif name == 'forward':
+            await page.go_forward()
+        elif name == 'reload':
+            await page.reload()
+        else:
+            raise ValueError(f"Unsupported function: {name}")
+    
+    async def _ensure_cursor(self) -> None:
+        """Inject cursor visualization into the page if it is not there yet."""
+        if self._cursor_injected:
+            return
+        
         try:
-            # Define constants for cursor and highlight element IDs
-            CURSOR_ID = "playwright_ai-cursor"
-            HIGHLIGHT_ID = "playwright_ai-highlight"
+            page = self.ai_browser_automation_page
+            
+            if not self._cursor_registered:
+                # Re-install automatically in every document loaded later
+                await page.add_init_script(_CURSOR_JS)
+                self._cursor_registered = True
             
             # Check if cursor already exists
-            cursor_exists = await self.ai_browser_automation_page.evaluate(
-                f"!!document.getElementById('{CURSOR_ID}')"
-            )
+            cursor_exists = await page.evaluate(_CURSOR_EXISTS_JS)
             
             if cursor_exists:
+                self._cursor_injected = True
                 return
             
             # Inject cursor and highlight elements
-            await self.ai_browser_automation_page.evaluate(f"""
-            (function() {{
-                // Create cursor element
-                const cursor = document.createElement('div');
-                cursor.id = '{CURSOR_ID}';
-                
-                // Use SVG for custom cursor
-                cursor.innerHTML = `
-                <svg xmlns="http://www.w3.org/2000/svg" version="1.1" viewBox="0 0 28 28" width="28" height="28">
-                    <polygon fill="#000000" points="9.2,7.3 9.2,18.5 12.2,15.6 12.6,15.5 17.4,15.5"/>
-                    <rect x="12.5" y="13.6" transform="matrix(0.9221 -0.3871 0.3871 0.9221 -5.7605 6.5909)" width="2" height="8" fill="#000000"/>
-                </svg>
-                `;
-                
-                // Style the cursor
-                cursor.style.position = 'absolute';
-                cursor.style.top = '0';
-                cursor.style.left = '0';
-                cursor.style.width = '28px';
-                cursor.style.height = '28px';
-                cursor.style.pointerEvents = 'none';
-                cursor.style.zIndex = '9999999';
-                cursor.style.transform = 'translate(-4px, -4px)';
-                
-                // Create highlight element for click animation
-                const highlight = document.createElement('div');
-                highlight.id = '{HIGHLIGHT_ID}';
-                highlight.style.position = 'absolute';
-                highlight.style.width = '20px';
-                highlight.style.height = '20px';
-                highlight.style.borderRadius = '50%';
-                highlight.style.backgroundColor = 'rgba(66, 134, 244, 0)';
-                highlight.style.transform = 'translate(-50%, -50%) scale(0)';
-                highlight.style.pointerEvents = 'none';
-                highlight.style.zIndex = '9999998';
-                highlight.style.transition = 'transform 0.3s ease-out, opacity 0.3s ease-out';
-                highlight.style.opacity = '0';
-                
-                // Add elements to document
-                document.body.appendChild(cursor);
-                document.body.appendChild(highlight);
-                
-                // Add functions to window
-                window.__updateCursorPosition = function(x, y) {{
-                    if (cursor) {{
-                        cursor.style.transform = `translate(${{x - 4}}px, ${{y - 4}}px)`;
-                    }}
-                }};
-                
-                window.__animateClick = function(x, y) {{
-                    if (highlight) {{
-                        highlight.style.left = `${{x}}px`;
-                        highlight.style.top = `${{y}}px`;
-                        highlight.style.transform = 'translate(-50%, -50%) scale(1)';
-                        highlight.style.opacity = '1';
-                        
-                        setTimeout(() => {{
-                            highlight.style.transform = 'translate(-50%, -50%) scale(0)';
-                            highlight.style.opacity = '0';
-                        }}, 300);
-                    }}
-                }};
-            }})();
-            """)
+            await page.evaluate(_CURSOR_JS)
+            self._cursor_injected = True
             
             self.logger.info(
                 "agent",
@@ -441,12 +603,55 @@ class AgentHandler:
                 f"Failed to inject cursor: {e}"
             )
     
+    async def _take_screenshot(self) -> str:
+        """Take screenshot and return as base64 JPEG."""
+        # JPEG is several times smaller than PNG to encode and upload, and
+        # vision models downscale the image anyway
+        screenshot_bytes = await self.ai_browser_automation_page.screenshot(
+            full_page=False, type='jpeg', quality=70
+        )
+        # base64 output is pure ASCII, so skip the UTF-8 decoder
+        return base64.b64encode(screenshot_bytes).decode('ascii')
+    
     async def _capture_and_send_screenshot(self) -> None:
         """Capture and send screenshot to agent."""
         if self.agent_client._screenshot_provider:
             screenshot = await self.agent_client._screenshot_provider()
             # Screenshot is automatically used by the agent client
     
+    def _schedule_screenshot(self) -> None:
+        """Start the post-action screenshot without blocking the action loop."""
+        client = self.agent_client
+        if not client._screenshot_provider:
+            return
+        
+        # Only the latest screenshot matters, so drop an unfinished one
+        pending = client._pending_screenshot
+        if pending is not None and not pending.done():
+            pending.cancel()
+        
+        task = asyncio.ensure_future(client._screenshot_provider())
+        task.add_done_callback(self._on_screenshot_done)
+        client._pending_screenshot = task
+    
+    def _on_screenshot_done(self, task: 'asyncio.Future[str]') -> None:
+        """Log a failed background screenshot."""
+        if task.cancelled():
+            return
+        e = task.exception()
+        if e is not None:
+            self.logger.warn(
+                "agent",
+                f"Failed to take screenshot after action: {e}. Continuing execution."
+            )
+    
+    def _on_frame_navigated(self, frame: Any) -> None:
+        """Refresh client page state after a main-frame navigation."""
+        if frame.parent_frame is None:
+            self._cursor_injected = False
+            self._update_client_url()
+            self._update_client_viewport()
+    
     def _update_client_viewport(self) -> None:
         """Update agent client with current viewport size."""
         viewport = self.ai_browser_automation_page.viewport_size
@@ -462,66 +667,35 @@ class AgentHandler:
         """Update cursor position on the page."""
         try:
             await self.ai_browser_automation_page.evaluate(
-                f"""
-                if (window.__updateCursorPosition) {{
-                    window.__updateCursorPosition({x}, {y});
-                }}
-                """
+                "([x, y]) => window.__updateCursorPosition && window.__updateCursorPosition(x, y)",
+                [x, y],
             )
         except:
             # Silently fail if cursor update fails
             pass
     
-    async def _animate_click(self, x: float, y: float) -> None:
-        """Animate a click at the given position."""
+    async def _show_click(self, x: float, y: float, clicks: int = 1) -> None:
+        """Move the cursor to a position and animate clicks there, 200 ms apart."""
         try:
             await self.ai_browser_automation_page.evaluate(
-                f"""
-                if (window.__animateClick) {{
-                    window.__animateClick({x}, {y});
-                }}
-                """
+                """([x, y, clicks]) => {
+                    if (window.__updateCursorPosition) window.__updateCursorPosition(x, y);
+                    if (!window.__animateClick) return;
+                    for (let i = 0; i < clicks; i++) {
+                        setTimeout(() => window.__animateClick(x, y), i * 200);
+                    }
+                }""",
+                [x, y, clicks],
             )
-        except:
+        except Exception:
             # Silently fail if animation fails
             pass
     
     def _convert_key_name(self, key: str) -> str:
         """Convert key names to Playwright format."""
-        # Map of common key names
-        key_map = {
-            "ENTER": "Enter",
-            "RETURN": "Enter",
-            "ESCAPE": "Escape",
-            "ESC": "Escape",
-            "BACKSPACE": "Backspace",
-            "TAB": "Tab",
-            "SPACE": " ",
-            "ARROWUP": "ArrowUp",
-            "ARROWDOWN": "ArrowDown",
-            "ARROWLEFT": "ArrowLeft",
-            "ARROWRIGHT": "ArrowRight",
-            "UP": "ArrowUp",
-            "DOWN": "ArrowDown",
-            "LEFT": "ArrowLeft",
-            "RIGHT": "ArrowRight",
-            "DELETE": "Delete",
-            "DEL": "Delete",
-            "HOME": "Home",
-            "END": "End",
-            "PAGEUP": "PageUp",
-            "PAGEDOWN": "PageDown",
-            "SHIFT": "Shift",
-            "CONTROL": "Control",
-            "CTRL": "Control",
-            "ALT": "Alt",
-            "META": "Meta",
-            "COMMAND": "Meta",
-            "CMD": "Meta",
-        }
-        
-        # Convert to uppercase for case-insensitive matching
-        upper_key = key.upper()
+        # Already in Playwright format
+        if key in _KEY_PASSTHROUGH:
+            return key
         
-        # Return mapped key or original
-        return key_map.get(upper_key, key)
\ No newline at end of file
+        # Case-insensitive lookup; return mapped key or original
+        return _KEY_MAP.get(key.upper(), key)
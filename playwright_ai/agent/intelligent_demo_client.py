@@ -1,8 +1,10 @@
 """Intelligent demo agent client with dynamic decision making."""
 
-from typing import Dict, Any, Optional, TYPE_CHECKING, List
+from typing import Dict, Any, Optional, TYPE_CHECKING, List, Set, Tuple
 import logging
 import asyncio
+import inspect
+import os
 import re
 
 from .base_multi_step_client import BaseMultiStepClient
@@ -20,6 +22,105 @@ if TYPE_CHECKING:
     from ..utils.logger import PlaywrightAILogger
 
 
+class _InspectWithoutStack:
+    """Stand-in for the inspect module whose stack() returns no frames."""
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(inspect, name)
+    
+    @staticmethod
+    def stack(context: int = 1) -> List[inspect.FrameInfo]:
+        return []
+
+
+def _disable_playwright_stack_capture() -> None:
+    """
+    Stop playwright from walking the Python stack on every API call.
+    
+    Playwright captures the caller's stack with inspect.stack() for its
+    tracing metadata, which is a sizeable share of the cost of each
+    observe/act/goto. This relies on playwright internals, so it is opt-in
+    and does nothing if they are not shaped as expected.
+    """
+    try:
+        from playwright._impl import _connection
+    except ImportError:
+        return
+    if getattr(getattr(_connection, 'inspect', None), 'stack', None) is inspect.stack:
+        _connection.inspect = _InspectWithoutStack()
+
+
+# PW_INSPECT_STACK=0 trades playwright's call-site tracing info for speed
+if os.getenv("PW_INSPECT_STACK") == "0":
+    _disable_playwright_stack_capture()
+
+
+# Resource types that do not affect what observe/act can find
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+# Turns off CSS animations and transitions in the current document
+_NO_ANIMATIONS_JS = """() => {
+    if (document.getElementById('playwright_ai-no-animations')) return;
+    const style = document.createElement('style');
+    style.id = 'playwright_ai-no-animations';
+    style.textContent = '*, *::before, *::after { animation: none !important; transition: none !important; }';
+    (document.head || document.documentElement).appendChild(style);
+}"""
+
+# Undoes _NO_ANIMATIONS_JS
+_RESTORE_ANIMATIONS_JS = """() => {
+    const style = document.getElementById('playwright_ai-no-animations');
+    if (style) style.remove();
+}"""
+
+
+async def _block_non_essential(route: Any) -> None:
+    """Route handler aborting images, fonts, media and analytics requests."""
+    request = route.request
+    resource_type = request.resource_type
+    if resource_type in _BLOCKED_RESOURCE_TYPES or (
+        # URL heuristic only for subresources; never fail a page load
+        resource_type != "document"
+        and not request.is_navigation_request()
+        and "analytics" in request.url
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+# Instruction parsing patterns, compiled once
+_URL_RE = re.compile(r'https?://[^\s]+')
+_SEARCH_RES = tuple(re.compile(p) for p in (
+    r"search for ['\"]?([^'\"]+)['\"]?",
+    r"search ['\"]?([^'\"]+)['\"]?",
+    r"find ['\"]?([^'\"]+)['\"]?",
+    r"look for ['\"]?([^'\"]+)['\"]?",
+))
+
+# Site keywords recognised in instructions, checked in order
+_SITE_PATTERNS = (
+    ('github', 'https://github.com'),
+    ('google', 'https://google.com'),
+    ('amazon', 'https://amazon.com'),
+    ('stackoverflow', 'https://stackoverflow.com'),
+)
+
+
+# Completed-action tag -> phrase groups recording it in the conversation; a
+# group matches when all of its phrases occur in the same item
+_COMPLETION_MARKERS = (
+    ('navigated', (('navigated to',),)),
+    ('found_search', (('found search box',),)),
+    ('clicked_search', (('clicked on search box',), ('clicked search box',))),
+    ('typed_query', (('typed', 'search'),)),
+    ('submitted_search', (('search submitted',), ('submitted search',))),
+    ('searched', (('searched for',),)),
+    ('clicked_result', (('clicked on', 'result'),)),
+    ('added_to_cart', (('added to cart',),)),
+)
+
+
 class IntelligentDemoClient(BaseMultiStepClient):
     """
     Intelligent demo agent that simulates AI-based decision making.
@@ -42,10 +143,48 @@ class IntelligentDemoClient(BaseMultiStepClient):
         self._page = None
         self._current_state = {}
         self._action_history = []
+        # Last page analysis, keyed by (url, page epoch)
+        self._page_state_cache: Optional[Tuple[Tuple[str, int], Dict[str, Any]]] = None
+        # Bumped whenever this client acts on the page
+        self._page_epoch = 0
+        # Skip images, fonts, media and analytics on the page (opt-in)
+        self._resource_block_enabled = bool(client_options.get('block_resources', False))
+        # Page the route/style are currently applied to, so they can be undone
+        self._resource_blocked_page: Any = None
+        # Pending undo for a page replaced by set_page
+        self._resource_unblock_task: Optional[asyncio.Task] = None
+        # Parsed task components by instruction; the instruction does not
+        # change across the steps of a task
+        self._parsed_instruction_cache: Dict[str, Dict[str, Any]] = {}
+        # Compact log of action results, one line per step; sent back as a
+        # single assistant item instead of the growing list of results
+        self._cso = ""
     
     def set_page(self, page: Any) -> None:
         """Set the page instance for act/observe/extract."""
+        blocked = self._resource_blocked_page
+        if blocked is not None and blocked is not page:
+            # Hand the previous page back unmodified
+            self._resource_blocked_page = None
+            try:
+                self._resource_unblock_task = asyncio.get_running_loop().create_task(
+                    self._remove_resource_blocking(page=blocked)
+                )
+            except RuntimeError:
+                # No running loop to undo it on; just forget the page
+                pass
         self._page = page
+        self._page_state_cache = None
+    
+    async def execute(self, options: AgentExecutionOptions) -> AgentResult:
+        """Run the task, then undo any resource blocking on the page."""
+        try:
+            return await super().execute(options)
+        finally:
+            await self._remove_resource_blocking()
+            if self._resource_unblock_task is not None:
+                await self._resource_unblock_task
+                self._resource_unblock_task = None
     
     async def execute_step(
         self,
@@ -66,9 +205,11 @@ class IntelligentDemoClient(BaseMultiStepClient):
             return self._create_error_result("No page instance available")
         
         try:
-            # Extract instruction and conversation history
+            if self._resource_block_enabled:
+                await self._apply_resource_blocking()
+            
+            # Extract instruction
             instruction = self._extract_instruction(input_items)
-            conversation = self._build_conversation_context(input_items)
             
             # Analyze current page state (simulate screenshot analysis)
             page_analysis = await self._analyze_page_state()
@@ -76,7 +217,7 @@ class IntelligentDemoClient(BaseMultiStepClient):
             # Make intelligent decision about next action
             decision = await self._decide_next_action(
                 instruction, 
-                conversation, 
+                input_items, 
                 page_analysis
             )
             
@@ -103,6 +244,36 @@ class IntelligentDemoClient(BaseMultiStepClient):
             self._log_error("agent:intelligent", f"Error in step: {e}")
             return self._create_error_result(str(e))
     
+    async def _apply_resource_blocking(self) -> None:
+        """Block non-essential resources and CSS animations on the page."""
+        page = self._page
+        try:
+            if self._resource_blocked_page is not page:
+                await page.route("**/*", _block_non_essential)
+                self._resource_blocked_page = page
+            # Navigations drop the style, so re-add it each step (idempotent)
+            await page.evaluate(_NO_ANIMATIONS_JS)
+        except Exception as e:
+            self._log_info("agent:intelligent", f"Could not block page resources: {e}")
+    
+    async def _remove_resource_blocking(self, page: Any = None) -> None:
+        """
+        Remove the route and animation style added by _apply_resource_blocking.
+        
+        Args:
+            page: Page to restore; defaults to the currently blocked page
+        """
+        if page is None:
+            page = self._resource_blocked_page
+            if page is None:
+                return
+            self._resource_blocked_page = None
+        try:
+            await page.unroute("**/*", _block_non_essential)
+            await page.evaluate(_RESTORE_ANIMATIONS_JS)
+        except Exception as e:
+            self._log_info("agent:intelligent", f"Could not restore page resources: {e}")
+    
     async def _analyze_page_state(self) -> Dict[str, Any]:
         """
         Analyze current page state (simulates screenshot analysis).
@@ -113,45 +284,62 @@ class IntelligentDemoClient(BaseMultiStepClient):
         3. Get back understanding of what's on the page
         
         For demo, we use act/observe to understand the page.
+        
+        The result is reused until the URL changes or this client acts on
+        the page again.
         """
+        url = self._page.url if hasattr(self._page, 'url') else 'unknown'
+        key = (url, self._page_epoch)
+        cached = self._page_state_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
         state = {
-            'url': self._page.url if hasattr(self._page, 'url') else 'unknown',
+            'url': url,
             'title': '',
             'has_search_box': False,
             'has_results': False,
             'elements': []
         }
         
-        # Get page title
-        try:
-            title = await self._page.evaluate("document.title")
-            state['title'] = title
-        except:
-            pass
+        page = self._page
         
-        # Check for common elements
-        try:
-            # Look for search box
-            search_elements = await self._page.observe("search box, search input, search field")
-            state['has_search_box'] = bool(search_elements)
-            
-            # Look for results
-            result_elements = await self._page.observe("search results, result items, product listings")
-            state['has_results'] = bool(result_elements)
-            
-            # Get visible elements
-            visible_elements = await self._page.observe("clickable elements, buttons, links")
-            state['elements'] = visible_elements or []
-            
-        except Exception as e:
-            self._log_info("agent:intelligent", f"Error analyzing page: {e}")
+        async def check_elements() -> None:
+            # Observes run one at a time: each enables and then disables the
+            # DOM/Accessibility domains on the shared CDP session, so
+            # concurrent observes would cut each other off mid-snapshot
+            try:
+                # Look for search box
+                search_elements = await page.observe("search box, search input, search field")
+                state['has_search_box'] = bool(search_elements)
+                
+                # Look for results
+                result_elements = await page.observe("search results, result items, product listings")
+                state['has_results'] = bool(result_elements)
+                
+                # Get visible elements
+                visible_elements = await page.observe("clickable elements, buttons, links")
+                state['elements'] = visible_elements or []
+                
+            except Exception as e:
+                self._log_info("agent:intelligent", f"Error analyzing page: {e}")
+        
+        # The title lookup doesn't touch those domains, so it overlaps the observes
+        title, _ = await asyncio.gather(
+            page.evaluate("document.title"),
+            check_elements(),
+            return_exceptions=True,
+        )
+        if not isinstance(title, BaseException):
+            state['title'] = title
         
+        self._page_state_cache = (key, state)
         return state
     
     async def _decide_next_action(
         self, 
         instruction: str, 
-        conversation: List[Dict[str, str]], 
+        input_items: List[ResponseInputItem], 
         page_state: Dict[str, Any]
     ) -> Dict[str, Any]:
         """
@@ -166,10 +354,13 @@ class IntelligentDemoClient(BaseMultiStepClient):
         url = page_state.get('url', '').lower()
         
         # Parse instruction to understand the task
-        task_components = self._parse_instruction(instruction)
+        task_components = self._parsed_instruction_cache.get(instruction)
+        if task_components is None:
+            task_components = self._parse_instruction(instruction)
+            self._parsed_instruction_cache[instruction] = task_components
         
         # Check what we've already done
-        completed_actions = self._get_completed_actions(conversation)
+        completed_actions = self._get_completed_actions(input_items)
         
         # Decision tree based on task and state
         
@@ -230,7 +421,7 @@ class IntelligentDemoClient(BaseMultiStepClient):
             }
         
         # 5. Generic action execution
-        if not any(completed_actions):
+        if not completed_actions:
             return {
                 'action': 'execute_generic',
                 'instruction': instruction,
@@ -257,33 +448,19 @@ class IntelligentDemoClient(BaseMultiStepClient):
         }
         
         # Extract target site
-        site_patterns = {
-            'github': 'https://github.com',
-            'google': 'https://google.com',
-            'amazon': 'https://amazon.com',
-            'stackoverflow': 'https://stackoverflow.com'
-        }
-        
-        for site, url in site_patterns.items():
+        for site, url in _SITE_PATTERNS:
             if site in instruction_lower:
                 components['target_site'] = url
                 break
         
         # Extract explicit URLs
-        url_match = re.search(r'https?://[^\s]+', instruction)
+        url_match = _URL_RE.search(instruction)
         if url_match:
             components['target_site'] = url_match.group(0)
         
         # Extract search query
-        search_patterns = [
-            r"search for ['\"]?([^'\"]+)['\"]?",
-            r"search ['\"]?([^'\"]+)['\"]?",
-            r"find ['\"]?([^'\"]+)['\"]?",
-            r"look for ['\"]?([^'\"]+)['\"]?"
-        ]
-        
-        for pattern in search_patterns:
-            match = re.search(pattern, instruction_lower)
+        for pattern in _SEARCH_RES:
+            match = pattern.search(instruction_lower)
             if match:
                 components['search_query'] = match.group(1).strip()
                 # Clean up query
@@ -310,29 +487,35 @@ class IntelligentDemoClient(BaseMultiStepClient):
         
         return components
     
-    def _get_completed_actions(self, conversation: List[Dict[str, str]]) -> List[str]:
+    def _get_completed_actions(self, input_items: List[ResponseInputItem]) -> Set[str]:
         """Extract what actions have been completed from conversation."""
-        completed = []
+        completed: Set[str] = set()
+        # Markers not matched yet; a marker found once is never scanned again
+        pending = _COMPLETION_MARKERS
         
-        for item in conversation:
-            content = item.get('content', '').lower()
+        for item in input_items:
+            # Conversation messages and tool results carry the history
+            if not (item.get('role') or item.get('type') == 'tool_result'):
+                continue
+            content = item.get('content')
+            if not content:
+                continue
+            if type(content) is not str:
+                content = str(content)
             
-            if 'navigated to' in content:
-                completed.append('navigated')
-            if 'found search box' in content:
-                completed.append('found_search')
-            if 'clicked on search box' in content or 'clicked search box' in content:
-                completed.append('clicked_search')
-            if 'typed' in content and 'search' in content:
-                completed.append('typed_query')
-            if 'search submitted' in content or 'submitted search' in content:
-                completed.append('submitted_search')
-            if 'searched for' in content:
-                completed.append('searched')
-            if 'clicked on' in content and 'result' in content:
-                completed.append('clicked_result')
-            if 'added to cart' in content:
-                completed.append('added_to_cart')
+            # The result log holds one step per line; match each on its own
+            for line in content.lower().splitlines():
+                if not pending:
+                    return completed
+                
+                remaining = []
+                for marker in pending:
+                    tag, alternatives = marker
+                    if any(all(phrase in line for phrase in alt) for alt in alternatives):
+                        completed.add(tag)
+                    else:
+                        remaining.append(marker)
+                pending = remaining
         
         return completed
     
@@ -340,6 +523,11 @@ class IntelligentDemoClient(BaseMultiStepClient):
         """Execute the action decided by our analysis."""
         action_type = decision['action']
         
+        # Anything but a lookup may change the page, so the cached analysis
+        # no longer applies
+        if action_type != 'find_search':
+            self._page_epoch += 1
+        
         try:
             if action_type == 'navigate':
                 url = decision['target']
@@ -353,6 +541,10 @@ class IntelligentDemoClient(BaseMultiStepClient):
             elif action_type == 'find_search':
                 elements = await self._page.observe("Find search box or search input")
                 success = bool(elements)
+                # Feed the fresh lookup into the cached analysis so the next
+                # step sees it without re-analyzing the page
+                if self._page_state_cache is not None:
+                    self._page_state_cache[1]['has_search_box'] = success
                 return {
                     'action': AgentAction(type='observe', description='Find search box', success=success),
                     'message': "Found search box" if success else "Could not find search box",
@@ -435,36 +627,24 @@ class IntelligentDemoClient(BaseMultiStepClient):
                 return str(item['content'])
         return ""
     
-    def _build_conversation_context(self, input_items: List[ResponseInputItem]) -> List[Dict[str, str]]:
-        """Build conversation context from input items."""
-        conversation = []
-        
-        for item in input_items:
-            if item.get('role'):
-                conversation.append({
-                    'role': item['role'],
-                    'content': str(item.get('content', ''))
-                })
-            elif item.get('type') == 'tool_result':
-                conversation.append({
-                    'role': 'assistant',
-                    'content': str(item.get('content', ''))
-                })
-        
-        return conversation
-    
     def _create_next_input_items(
         self, 
         current_items: List[ResponseInputItem], 
         action_result: Dict[str, Any]
     ) -> List[ResponseInputItem]:
         """Create input items for next step."""
-        next_items = list(current_items)
+        # Keep the system/user items; the previous log item is replaced
+        next_items = [
+            item for item in current_items
+            if item.get('role') in ('system', 'user')
+        ]
         
-        # Add the result of this action
+        # Add the result of this action to the log
+        message = ' '.join(str(action_result['message']).splitlines())
+        self._cso = f"{self._cso}{message}\n"
         next_items.append({
-            'type': 'tool_result',
-            'content': action_result['message']
+            'role': 'assistant',
+            'content': self._cso
         })
         
         return next_items
@@ -502,6 +682,10 @@ class IntelligentDemoClient(BaseMultiStepClient):
     def create_initial_input_items(self, instruction: str) -> List[ResponseInputItem]:
         """Create initial conversation items."""
         items: List[ResponseInputItem] = []
+        self._cso = ""
+        self._parsed_instruction_cache.clear()
+        # A new task may follow in-page changes the URL does not reflect
+        self._page_state_cache = None
         
         if self.user_provided_instructions:
             items.append({
@@ -543,6 +727,6 @@ class IntelligentDemoClient(BaseMultiStepClient):
             Screenshot data URL
         """
         if self._screenshot_provider:
-            base64_image = await self._screenshot_provider()
-            return f"data:image/png;base64,{base64_image}"
-        return "data:image/png;base64,placeholder"
\ No newline at end of file
+            base64_image = await self._screenshot_base64()
+            return f"data:image/jpeg;base64,{base64_image}"
+        return "data:image/jpeg;base64,placeholder"
\ No newline at end of file
@@ -350,8 +350,8 @@ class OpenAIAgentClient(BaseMultiStepClient):
         """Capture screenshot and return as data URL."""
         if self._screenshot_provider:
             try:
-                base64_image = await self._screenshot_provider()
-                return f"data:image/png;base64,{base64_image}"
+                base64_image = await self._screenshot_base64()
+                return f"data:image/jpeg;base64,{base64_image}"
             except Exception as e:
                 self._log_error(
                     "agent:openai",
@@ -360,7 +360,7 @@ class OpenAIAgentClient(BaseMultiStepClient):
                 raise
         
         # Return placeholder if no provider
-        return "data:image/png;base64,placeholder"
+        return "data:image/jpeg;base64,placeholder"
     
     async def capture_screenshot(self, options: Optional[Dict[str, Any]] = None) -> str:
         """
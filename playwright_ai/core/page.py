@@ -3,7 +3,7 @@
 import asyncio
 import time
 import weakref
-from typing import Optional, Any, Dict, List, Union, TYPE_CHECKING, TypeVar
+from typing import Optional, Any, Dict, List, Tuple, Union, TYPE_CHECKING, TypeVar
 from playwright.async_api import Page, CDPSession
 
 from ..types import (
@@ -55,6 +55,9 @@ class PlaywrightAIPage(CDPIntegration):
         self._logger = context.playwright_ai.logger.child(component="page")
         self._cdp_session: Optional[CDPSession] = None
         self._cdp_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()  # CDP session cache
+        self._frame_meta_cache: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()  # iframe metadata cache
+        self._agent_handler: Optional['AgentHandler'] = None  # latest agent() handler
+        self._cdp_domain_refs: Dict[Tuple[int, str], int] = {}  # (id(session), domain) → enable count
         
         # Frame tracking
         self._frame_ordinals: Dict[Optional[str], int] = {None: 0}  # None for main frame
@@ -373,6 +376,9 @@ if (!window.__aiBrowserAutomationInjected) {{
         """
         Create an agent for autonomous task execution.
         
+        The handler previously returned for this page is closed and stops
+        tracking the page's navigations.
+        
         Args:
             model_name: Optional model name override
             **options: Agent configuration options
@@ -406,13 +412,18 @@ if (!window.__aiBrowserAutomationInjected) {{
             agent_type="openai" if "gpt" in actual_model.lower() else "anthropic"
         )
         
+        # Detach the previous handler so it does not outlive its replacement
+        if self._agent_handler is not None:
+            self._agent_handler.close()
+        
         # Create and return handler
-        return AgentHandler(
+        self._agent_handler = AgentHandler(
             playwright_ai=self.playwright_ai,
             ai_browser_automation_page=self,
             logger=self._logger,
             options=handler_options,
         )
+        return self._agent_handler
     
     async def get_cdp_client(self, target: Optional[Union[Page, Any]] = None) -> CDPSession:
         """
@@ -476,8 +487,17 @@ if (!window.__aiBrowserAutomationInjected) {{
         Args:
             domain: CDP domain name
             target: Optional target (defaults to main page)
+        
+        Enables are reference-counted per session, so overlapping users of a
+        shared session (e.g. same-process iframes) keep the domain enabled
+        until the last of them calls disable_cdp.
         """
-        await self.send_cdp(f"{domain}.enable", {}, target)
+        session = await self.get_cdp_client(target or self._page)
+        key = (id(session), domain)
+        count = self._cdp_domain_refs.get(key, 0)
+        self._cdp_domain_refs[key] = count + 1
+        if count == 0:
+            await session.send(f"{domain}.enable", {})
     
     async def disable_cdp(self, domain: str, target: Optional[Any] = None) -> None:
         """
@@ -488,7 +508,15 @@ if (!window.__aiBrowserAutomationInjected) {{
             domain: CDP domain name
             target: Optional target (defaults to main page)
         """
-        await self.send_cdp(f"{domain}.disable", {}, target)
+        session = await self.get_cdp_client(target or self._page)
+        key = (id(session), domain)
+        count = self._cdp_domain_refs.get(key, 0)
+        if count > 1:
+            # Someone else still relies on the domain
+            self._cdp_domain_refs[key] = count - 1
+            return
+        self._cdp_domain_refs.pop(key, None)
+        await session.send(f"{domain}.disable", {})
     
     async def _ensure_cdp_session(self) -> CDPSession:
         """
@@ -750,6 +778,9 @@ if (!window.__aiBrowserAutomationInjected) {{
     async def close(self, **kwargs: Any) -> None:
         """Close the page."""
         self._logger.info("page:close", "Closing page")
+        if self._agent_handler is not None:
+            self._agent_handler.close()
+            self._agent_handler = None
         await self._page.close(**kwargs)
     
     @property
@@ -1,6 +1,7 @@
 """ActHandler implementation for executing browser actions."""
 
 import asyncio
+import re
 from typing import Union, Dict, Any, Optional, Callable, TYPE_CHECKING
 
 from .base import BaseHandler
@@ -19,6 +20,20 @@ if TYPE_CHECKING:
     from ..core.page import PlaywrightAIPage
 
 
+# Quoted label in an instruction, e.g. "Click the 'More information' link".
+# Quotes must stand apart from words so apostrophes ("Google's") don't count
+_QUOTED_LABEL_RE = re.compile(r"(?<!\w)['\"]([^'\"]+)['\"](?!\w)")
+
+# Instruction keywords (whole words) that map directly onto an ARIA role
+_LABEL_ROLES = (
+    (re.compile(r"\blink\b"), "link"),
+    (re.compile(r"\bbutton\b"), "button"),
+)
+
+# Actionability wait for the fast path; a miss falls back to observation
+_LITERAL_CLICK_TIMEOUT_MS = 2000
+
+
 class ActHandler(BaseHandler[ActResult]):
     """
     Handler for executing actions on web pages.
@@ -332,6 +347,13 @@ class ActHandler(BaseHandler[ActResult]):
         else:
             instruction_str = instruction
         
+        # Unambiguous literal labels can be resolved by Playwright's role engine
+        # without an LLM round-trip or XPath evaluation
+        if isinstance(instruction, str) and options.action == ActionType.CLICK:
+            fast_result = await self._try_literal_click(page, instruction)
+            if fast_result is not None:
+                return fast_result
+        
         self._log_debug("Observing page for action", instruction=instruction_str)
         
         # Note: Combined actions like "fill X and click Y" should be handled by the user
@@ -356,6 +378,52 @@ class ActHandler(BaseHandler[ActResult]):
         # Execute the action
         return await self._execute_from_observe_result(page, observe_result, options)
     
+    async def _try_literal_click(
+        self,
+        page: 'PlaywrightAIPage',
+        instruction: str
+    ) -> Optional[ActResult]:
+        """
+        Click a quoted link/button label directly via a role selector.
+        
+        Returns None when the instruction has no quoted label, names no
+        supported role, or the label does not match exactly one element,
+        so the caller can fall back to observation.
+        """
+        label_match = _QUOTED_LABEL_RE.search(instruction)
+        if not label_match:
+            return None
+        
+        instruction_lower = instruction.lower()
+        role = next(
+            (role for keyword, role in _LABEL_ROLES if keyword.search(instruction_lower)),
+            None
+        )
+        if role is None:
+            return None
+        
+        label = label_match.group(1).strip()
+        # Exact accessible name only; a substring match could hit another element
+        locator = page._page.get_by_role(role, name=label, exact=True)
+        
+        try:
+            if await locator.count() != 1:
+                return None
+            await locator.click(timeout=_LITERAL_CLICK_TIMEOUT_MS)
+        except Exception as e:
+            self._log_debug("Literal click fast path failed", label=label, error=str(e))
+            return None
+        
+        self._log_debug("Clicked element by role and label", role=role, label=label)
+        
+        return ActResult(
+            success=True,
+            action=ActionType.CLICK,
+            selector=f'role={role}[name="{label}"]',
+            description=instruction,
+            metadata={"method": "click", "arguments": [], "fast_path": True}
+        )
+    
     async def _attempt_self_healing(
         self,
         page: 'PlaywrightAIPage',